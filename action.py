@@ -12,3 +12,8 @@ class Action(Enum):
     DOWN  = (0, -1)
     LEFT  = (-1, 0)
     RIGHT = (1, 0)
+
+
+# Fixed order of all actions, used wherever actions are integer-indexed.
+ACTIONS = (Action.UP, Action.DOWN, Action.LEFT, Action.RIGHT)
+ACTION_INDICES = {action: index for index, action in enumerate(ACTIONS)}
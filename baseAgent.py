@@ -41,7 +41,7 @@ class BaseAgent:
         while True:
             try:
                 action = self.policy.select_action(
-                    self.maze[self.current_coordinate]
+                    self.maze.state_at(self.current_coordinate)
                 )
                 
                 # no actions to be taken if terminal state is reached
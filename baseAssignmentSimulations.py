@@ -51,7 +51,7 @@ def simulate_base_assignment_B()-> None:
     print(f"\033[32m{'─'*45}\n\t\tAgent actions\n{'─'*45}\033[0m")
     print(agent)
     # keep going until terminate state is reached
-    while not maze[agent.current_coordinate].is_terminal:
+    while not maze.state_at(agent.current_coordinate).is_terminal:
         agent.act(True)
 
 def simulate_base_assignment_C()-> None:
@@ -94,7 +94,7 @@ def simulate_base_assignment_C()-> None:
     agent.policy = policy
     print(agent)
     # keep going until terminate state is reached
-    while not maze[agent.current_coordinate].is_terminal:
+    while not maze.state_at(agent.current_coordinate).is_terminal:
         agent.act(True)
 
 def simulate_base_assignment_EXTRA()-> None:
@@ -142,5 +142,5 @@ def simulate_base_assignment_EXTRA()-> None:
 
     print(agent)
     # keep going until terminate state is reached
-    while not maze[agent.current_coordinate].is_terminal:
+    while not maze.state_at(agent.current_coordinate).is_terminal:
         agent.act(True)
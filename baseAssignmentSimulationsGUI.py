@@ -1,5 +1,4 @@
 import numpy as np
-import pygame
 
 from baseAgent import BaseAgent
 from basePolicy import BasePolicy
@@ -14,6 +13,8 @@ def simulate_base_assignment_A()-> None:
     Creates maze from assignment.
     Print said maze.
     """
+    import pygame
+
     maze_shape = (4,4)
     rewards = np.array([
         [10,  -1,  -1,  -1],
@@ -55,6 +56,8 @@ def simulate_base_assignment_B()-> None:
     Print maze with agent.
     Let agent walk random path until terminal state is reached.
     """
+    import pygame
+
     maze_shape = (4,4)
     rewards = np.array([
         [10,  -1,  -1,  -1],
@@ -99,7 +102,7 @@ def simulate_base_assignment_B()-> None:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-        if not maze[agent.current_coordinate].is_terminal:
+        if not maze.state_at(agent.current_coordinate).is_terminal:
             agent.act()
         draw_matrix(
             data_matrix, 
@@ -123,6 +126,8 @@ def simulate_base_assignment_C()-> None:
     Print both.
     Have agent perform this optimal policy in maze.
     """
+    import pygame
+
     maze_shape = (4,4)
     rewards = np.array([
         [10,  -1,  -1,  -1],
@@ -179,7 +184,7 @@ def simulate_base_assignment_C()-> None:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-        if not maze[agent.current_coordinate].is_terminal:
+        if not maze.state_at(agent.current_coordinate).is_terminal:
             agent.act()
         draw_matrix(
             data_matrix, 
@@ -205,6 +210,8 @@ def simulate_base_assignment_EXTRA()-> None:
     Have agent perform this optimal policy in maze, 
     using the probability.
     """
+    import pygame
+
     maze_shape = (4,4)
     probability = 0.7
 
@@ -265,7 +272,7 @@ def simulate_base_assignment_EXTRA()-> None:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-        if not maze[agent.current_coordinate].is_terminal:
+        if not maze.state_at(agent.current_coordinate).is_terminal:
             agent.act()
         draw_matrix(
             data_matrix, 
@@ -1,7 +1,9 @@
 from multipledispatch import dispatch
 import numpy as np
 
-from action import Action
+from action import Action, ACTIONS, ACTION_INDICES
+from mazeModel import MazeModel
+from stencilMazeModel import StencilMazeModel
 from state import State
 
 
@@ -16,14 +18,38 @@ class BaseMaze:
     any agent gets for entering the state on the given coordinate.
     """
 
+    # Actions that would leave the grid are invalid.
+    edge_mode = "wall"
+
     def __init__(
         self, 
         grid_shape: tuple[int, int], 
         rewards: np.ndarray
     )-> None:
         """
-        @var $states
-        **np.ndarray** Numpy matrix with all the states.
+        The maze is stored as contiguous arrays, rather than as one
+        `State` object per cell. `State` objects are only created when
+        the maze is indexed, or when `states` is requested.
+
+        @var $grid_shape
+        **tuple[int, int]** Shape of the maze.
+        @var $rewards
+        **np.ndarray** Numpy matrix with the reward of every cell.
+        @var $terminals
+        **np.ndarray** Numpy boolean matrix with the terminal cells.
+        @var $successors
+        **np.ndarray** (N, 4) successor table, with the flat index of
+        the cell reached by every action from every cell.
+        @see successor_table
+        @var $valid_actions
+        **np.ndarray** (N, 4) boolean mask of the valid actions.
+        @var $version
+        **int** Number of changes made by `set_rewards` and
+        `set_terminal`, starting at 0.
+        @var $edits
+        **np.ndarray** Numpy integer matrix with the `version` at which
+        every cell was last changed, 0 if it never changed.
+        @see changed_since
         """
         if grid_shape != rewards.shape:
             raise AttributeError(
@@ -31,11 +57,69 @@ class BaseMaze:
                 f" Expected {grid_shape}, got {rewards.shape}."
         )
 
-        # instantiate `states`, given the provided `grid_shape`
-        self.states = np.empty(shape=grid_shape, dtype=object)
-        for x in range(grid_shape[0]):
-            for y in range(grid_shape[1]):
-                self.states[x,y] = State((x,y), rewards[x,y], False)
+        self.grid_shape = tuple(grid_shape)
+        self.rewards = np.array(rewards)
+        self.terminals = np.zeros(grid_shape, dtype=bool)
+        self.version = 0
+        self.edits = np.zeros(grid_shape, dtype=np.int64)
+
+        # the table does not depend on terminal cells, 
+        # so it stays valid when terminals are set
+        self.successors = self.successor_table(self.grid_shape)
+        self.valid_actions = self.successors >= 0
+
+    @classmethod
+    def from_arrays(
+        cls, 
+        rewards: np.ndarray, 
+        terminals: np.ndarray
+    )-> "BaseMaze":
+        """
+        Create a maze around existing reward and terminal matrices.
+
+        Unlike the constructor, the matrices are not copied, so they
+        can be memory-mapped from disk. Changing the maze changes the
+        given matrices.
+
+        @param rewards: matrix with the reward of every cell.
+        @param terminals: boolean matrix with the terminal cells.
+
+        @return BaseMaze, or subclass, with given rewards and terminals
+        """
+        if rewards.shape != terminals.shape:
+            raise AttributeError(
+                f"`terminals` does not have the correct shape."
+                f" Expected {rewards.shape}, got {terminals.shape}."
+        )
+
+        maze = cls.__new__(cls)
+        maze.grid_shape = tuple(rewards.shape)
+        maze.rewards = rewards
+        maze.terminals = terminals
+        maze.version = 0
+        maze.edits = np.zeros(maze.grid_shape, dtype=np.int64)
+        maze.successors = cls.successor_table(maze.grid_shape)
+        maze.valid_actions = maze.successors >= 0
+        return maze
+
+    @property
+    def states(self)-> np.ndarray:
+        """
+        Numpy matrix with all the states.
+
+        NOTE: every call creates a new `State` object for every cell,
+        so this is only meant for small mazes. Changing these states
+        does not change the maze.
+
+        @return np.ndarray with a State for every cell
+        """
+        states = np.empty(shape=self.grid_shape, dtype=object)
+        rewards = self.rewards.tolist()
+        terminals = self.terminals.tolist()
+        for x in range(self.grid_shape[0]):
+            for y in range(self.grid_shape[1]):
+                states[x,y] = State((x,y), rewards[x][y], terminals[x][y])
+        return states
     
     @dispatch(tuple)
     def __getitem__(self, coordinate: tuple[int, int])-> State:
@@ -45,20 +129,14 @@ class BaseMaze:
         This method makes it possible for the maze class 
         to be indexable, using a tuple with an x and y coordinate.
 
+        NOTE: hot paths should use `state_at` instead, which skips
+        the dispatch overhead.
+
         @param coordinate: coordinate to get state from
 
         @return State with state on given coordinates
         """
-        try:
-            return self.states[coordinate]
-        except IndexError:
-            raise IndexError(
-                f"Index out of range."
-                f" Tried accessing index {coordinate} from `self.states`, "
-                f"which has shape of {self.states.shape}"
-            )
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+        return self.state_at(coordinate)
 
     @dispatch(State)
     def __getitem__(self, item: State)-> State:
@@ -68,36 +146,128 @@ class BaseMaze:
         This method checks if a given state is present in the class.
         Throws error if `item` is not found.
 
+        Every cell is identified by its position, so only the cell
+        on the position of `item` has to be compared with `item`.
+
         @param item: State object to look for
 
         @return State with requested State
         """
-        for row in self.states:
-            for state in row:
-                if state == item:
-                    return state
+        x, y = item.position
+        if 0 <= x < self.grid_shape[0] and 0 <= y < self.grid_shape[1]:
+            state = State(
+                (x, y), 
+                self.rewards[x, y], 
+                bool(self.terminals[x, y])
+            )
+            if state == item:
+                return state
         raise IndexError(
             f"Item not found."
             f" Looking for State {item} in `self.states`, "
             f"which was not found in maze:\n {str(self)}"
         )
 
+    def state_at(self, coordinate: tuple[int, int])-> State:
+        """
+        Get state on given coordinate.
+
+        @param coordinate: coordinate to get state from
+
+        @return State with state on given coordinates
+        """
+        try:
+            reward = self.rewards[coordinate]
+            is_terminal = bool(self.terminals[coordinate])
+        except IndexError:
+            raise IndexError(
+                f"Index out of range."
+                f" Tried accessing index {coordinate} from `self.states`, "
+                f"which has shape of {self.grid_shape}"
+            )
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            return
+
+        # negative indices wrap around, like they do for numpy
+        position = (
+            int(coordinate[0]) % self.grid_shape[0], 
+            int(coordinate[1]) % self.grid_shape[1]
+        )
+        return State(position, reward, is_terminal)
+
+    def state_at_index(self, index: int)-> State:
+        """
+        Get state on given flat index.
+
+        States are indexed in row-major order of the grid, 
+        like in a compiled `MazeModel`.
+        @see mazeModel.py
+
+        @param index: flat index to get state from
+
+        @return State with state on given index
+        """
+        if not 0 <= index < self.rewards.size:
+            raise IndexError(
+                f"Index out of range."
+                f" Tried accessing flat index {index} from `self.states`, "
+                f"which has {self.rewards.size} states"
+            )
+        x, y = divmod(int(index), self.grid_shape[1])
+        return State(
+            (x, y), 
+            self.rewards[x, y], 
+            bool(self.terminals[x, y])
+        )
+
+    def get_many(
+        self, 
+        coordinates: np.ndarray
+    )-> tuple[np.ndarray, np.ndarray]:
+        """
+        Get rewards and terminal flags for many coordinates at once.
+
+        No `State` objects are created. Negative coordinates wrap
+        around, like they do for numpy.
+
+        @param coordinates: (K, 2) array with x, y coordinates
+
+        @return tuple[np.ndarray, np.ndarray] with the (K,) rewards and
+        (K,) terminal flags on the given coordinates
+        """
+        coordinates = np.asarray(coordinates)
+        try:
+            return (
+                self.rewards[coordinates[:, 0], coordinates[:, 1]],
+                self.terminals[coordinates[:, 0], coordinates[:, 1]]
+            )
+        except IndexError:
+            raise IndexError(
+                f"Index out of range. Some of the given coordinates are"
+                f" out of range in a grid with shape {self.grid_shape}"
+            )
+
     def set_rewards(self, rewards: np.ndarray)-> None:
         """
         Setter for rewards in states.
 
         NOTE: `rewards` must match shape of `self.states`
+        Only the cells whose reward changes are marked as changed.
+        @see changed_since
 
         @param rewards: matrix with rewards corresponding to states.
         """
-        if self.states.shape != rewards.shape:
+        if self.grid_shape != rewards.shape:
             raise AttributeError(
                 f"`rewards` does not have the correct shape."
-                f" Expected {self.states.shape}, got {rewards.shape}."
+                f" Expected {self.grid_shape}, got {rewards.shape}."
         )
-        for x in range(self.states.shape[0]):
-            for y in range(self.states.shape[1]):
-                self.states.shape[x,y].reward = rewards[x,y]
+        changed = self.rewards != rewards
+        if changed.any():
+            self.version += 1
+            self.edits[changed] = self.version
+        self.rewards = np.array(rewards)
 
     def set_terminal(self, coordinate: tuple[int, int])-> None:
         """
@@ -108,16 +278,56 @@ class BaseMaze:
         @param coordinate: Coordinate of terminal state to be set.
         """
         try:
-            self.states[coordinate].is_terminal = True
+            if not self.terminals[coordinate]:
+                self.terminals[coordinate] = True
+                self.version += 1
+                self.edits[coordinate] = self.version
         except IndexError:
             raise IndexError(
                 f"Index out of range."
                 f" Tried accessing index {coordinate} from `self.states, "
-                f"which has shape of {self.states.shape}"
+                f"which has shape of {self.grid_shape}"
             )
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
+    def changed_since(self, version: int)-> np.ndarray:
+        """
+        Flat indices of all cells changed after `version`.
+
+        Every solver remembers the `version` of the maze it solved,
+        such that many solvers can share a maze, and each of them
+        sees all changes made after its own solution.
+        @see flat_index
+
+        @param version: `version` of the maze to compare with.
+
+        @return np.ndarray with flat index of every changed cell
+        """
+        return np.flatnonzero(self.edits > version)
+
+    def flat_index(self, coordinate: tuple[int, int])-> int:
+        """
+        Flat index of given coordinate.
+
+        States are indexed in row-major order of the grid, 
+        like in a compiled `MazeModel`.
+        Throws error if `coordinate` is outside of the maze.
+
+        @param coordinate: x, y coordinate inside of the maze
+
+        @return int with flat index of `coordinate`
+        """
+        x, y = coordinate
+        width, height = self.grid_shape
+        if not (0 <= x < width and 0 <= y < height):
+            raise IndexError(
+                f"Index out of range."
+                f" Tried accessing index {coordinate} from `self.states`, "
+                f"which has shape of {self.grid_shape}"
+            )
+        return x * self.grid_shape[1] + y
+
     def step(
         self, 
         start_coordinate: tuple[int, int], 
@@ -129,6 +339,7 @@ class BaseMaze:
         This function checks if a certain action, from a given state,
         is valid. If so, the new coordinate is returned.
         If not, a corresponding error will be returned.
+        Destinations are read from the precomputed `successors` table.
 
         @param start_coordinate: coordinate from where the `action`
             will be performed.
@@ -136,29 +347,25 @@ class BaseMaze:
 
         @return tuple[int, int] with end coordinate
         """
-        
-        new_coordinate = tuple(map(sum, zip(start_coordinate, action.value)))
-
-        # `new_coordinate` may not contain negative values
-        if new_coordinate[0] < 0 or new_coordinate[1] < 0:
-             raise IndexError(
-                f"This action is invalid. The new coordinate would be "
-                f"{new_coordinate}, which is out of range in a grid with shape"
-                f" {self.states.shape}"
+        destination = self.successors[
+            self.flat_index(start_coordinate), 
+            ACTION_INDICES[action]
+        ]
+
+        # actions leaving the grid have no destination
+        if destination < 0:
+            new_coordinate = (
+                start_coordinate[0] + action.value[0], 
+                start_coordinate[1] + action.value[1]
             )
-        # `new_coordinate` must be within the bounds of the grid
-        try:
-            self.states[new_coordinate]
-        except IndexError:
             raise IndexError(
                 f"This action is invalid. The new coordinate would be "
                 f"{new_coordinate}, which is out of range in a grid with shape"
-                f" {self.states.shape}"
+                f" {self.grid_shape}"
             )
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
         
-        return new_coordinate
+        x, y = divmod(int(destination), self.grid_shape[1])
+        return (x, y)
 
     def get_destinations(self, state: State)-> dict[Action: State]:
         """
@@ -178,17 +385,14 @@ class BaseMaze:
             return {}
 
         possible_destinations: dict[Action: State] = {}
-        for action in [
-            Action.UP, 
-            Action.DOWN, 
-            Action.LEFT, 
-            Action.RIGHT
-        ]:
-            try:
-                destination_coord = self.step(state.position, action)
-                possible_destinations[action] = self.states[destination_coord]
-            except:
-                continue
+        for action, destination in zip(
+            ACTIONS, 
+            self.successors[self.flat_index(state.position)].tolist()
+        ):
+            if destination >= 0:
+                possible_destinations[action] = self.state_at_index(
+                    destination
+                )
 
         # at least 1 action should be possible from given state, 
         # as we know it to no longer be terminal
@@ -198,6 +402,89 @@ class BaseMaze:
         
         return possible_destinations
 
+    @classmethod
+    def successor_table(cls, grid_shape: tuple[int, int])-> np.ndarray:
+        """
+        Successor table for a maze with the given shape.
+
+        Entry [s, a] holds the index of the state that is reached by
+        performing action `ACTIONS[a]` in the state with index s.
+        States are indexed in row-major order of the grid.
+        Actions that would leave the grid are invalid, marked with -1.
+        @see mazeModel.py
+
+        @param grid_shape: shape of the maze to create the table for.
+
+        @return np.ndarray with (N, 4) successor indices
+        """
+        width, height = grid_shape
+        x, y = np.divmod(np.arange(width * height), height)
+        successors = np.full((width * height, len(ACTIONS)), -1)
+        for index, action in enumerate(ACTIONS):
+            new_x, new_y = x + action.value[0], y + action.value[1]
+            inside = (new_x >= 0) & (new_x < width) & \
+                (new_y >= 0) & (new_y < height)
+            successors[inside, index] = new_x[inside] * height + \
+                new_y[inside]
+        return successors
+
+    def compile(
+        self, 
+        probability: float=1.0, 
+        sparse: bool=False,
+        dtype: np.dtype=np.float64
+    )-> MazeModel:
+        """
+        Compile maze into an integer-indexed model.
+
+        The boundary rules of the maze and the slip model of the
+        `ProbabilityAgent` are baked into the model, such that solvers
+        and simulators never have to touch `State` objects.
+        @see mazeModel.py
+
+        @param probability: probability for any given action to succeed
+        @param sparse: compile into a `SparseMazeModel`, with CSR
+        transition matrices, if True.
+        @param dtype: floating point type of the values and rewards.
+
+        @return MazeModel with compiled maze
+        """
+        model_class = MazeModel
+        if sparse:
+            # scipy is only imported when a sparse model is used
+            from sparseMazeModel import SparseMazeModel
+            model_class = SparseMazeModel
+        return model_class(
+            self.grid_shape,
+            self.successors,
+            self.rewards.astype(dtype).ravel(),
+            self.terminals.ravel().copy(),
+            probability,
+            dtype
+        )
+
+    def compile_stencil(
+        self,
+        probability: float=1.0,
+        dtype: np.dtype=np.float64
+    )-> StencilMazeModel:
+        """
+        Compile maze into a stencil model, without successor table.
+        @see stencilMazeModel.py
+
+        @param probability: probability for any given action to succeed
+        @param dtype: floating point type of the values and rewards.
+
+        @return StencilMazeModel with compiled maze
+        """
+        return StencilMazeModel(
+            self.rewards,
+            self.terminals,
+            self.edge_mode,
+            probability,
+            dtype
+        )
+
     def __str__(
         self, 
         agent_coordinate: tuple[int, int]=None, 
@@ -222,7 +509,7 @@ class BaseMaze:
         @return str with stringified current maze
         """
         # base case for the horizontal lines
-        deviding_line = f"{('─' * 18 + '┼') * (self.states.shape[0] - 1)}"\
+        deviding_line = f"{('─' * 18 + '┼') * (self.grid_shape[0] - 1)}"\
         f"{'─' * 18}"
 
         output = f"Maze class, with following grid:"\
@@ -233,7 +520,7 @@ class BaseMaze:
         reversed_transformed_states = self.states.T[::-1]
         for y, row in enumerate(reversed_transformed_states[:-1]):
             for x, state in enumerate(row.tolist()):
-                if (x, self.states.shape[1] - 1 - y) == agent_coordinate:
+                if (x, self.grid_shape[1] - 1 - y) == agent_coordinate:
                     output += state.__str__(agent_colour) + " │ "
                 else:
                     output += str(state) + " │ "
@@ -241,7 +528,7 @@ class BaseMaze:
 
         # different formatting for last line
         for x, state in enumerate(reversed_transformed_states[-1].tolist()):
-            if (x, self.states.shape[1] - \
+            if (x, self.grid_shape[1] - \
             reversed_transformed_states.shape[0]) == agent_coordinate:
                 output += state.__str__(agent_colour) + " │ "
             else:
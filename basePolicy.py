@@ -1,6 +1,8 @@
 import random
 
-from action import Action
+import numpy as np
+
+from action import Action, ACTION_INDICES
 from baseMaze import BaseMaze
 from state import State
 
@@ -37,6 +39,38 @@ class BasePolicy:
         index = random.randrange(0, 4)
         return [Action.UP, Action.DOWN, Action.LEFT, Action.RIGHT][index]
     
+    def action_table(self, maze: BaseMaze)-> np.ndarray:
+        """
+        Action index for every state of `maze`, if the policy is fixed.
+
+        Batched simulators use this table instead of calling
+        `select_action` for every agent and every step.
+        @see rolloutEngine.py
+
+        The table is built by calling `select_action` once for every
+        non-terminal state, so subclasses that override `select_action`
+        are simulated as they act, as long as their action only depends
+        on the state. An action that leaves the grid gets stuck, just
+        like an agent that keeps selecting it, so it is stored as no
+        action. This policy itself is random, so it has no table.
+
+        @param maze: BaseMaze object to create table for.
+
+        @return np.ndarray with (N,) action indices, -1 for no action,
+        or None for a uniformly random policy
+        """
+        if type(self).select_action is BasePolicy.select_action:
+            return None
+
+        table = np.full(maze.rewards.size, -1)
+        for index, state in enumerate(maze.states.flatten()):
+            if not state.is_terminal:
+                action = self.select_action(state)
+                if action is not None and \
+                        maze.valid_actions[index, ACTION_INDICES[action]]:
+                    table[index] = ACTION_INDICES[action]
+        return table
+
     def visualise(self, maze: BaseMaze)-> None:
         """
         print current Policy.
@@ -66,7 +100,7 @@ class BasePolicy:
 
         # base case for the horizontal lines
         deviding_line = \
-            f"{('─' * 16 + '┼') * (maze.states.shape[0] - 1)}"\
+            f"{('─' * 16 + '┼') * (maze.grid_shape[0] - 1)}"\
             f"{'─' * 16}"
 
         output = f"┌{deviding_line.replace('┼', '┬')}┐\n│ "
@@ -0,0 +1,169 @@
+import time
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from baseMaze import BaseMaze
+from solvers import precision_floor
+
+
+@dataclass
+class BatchResult:
+    """
+    BatchResult class
+
+    This class holds the solutions of a batch of reward scenarios.
+    Row k of the values and actions belongs to scenario k, with the
+    columns indexed like the model states. Sweeps, deltas and error
+    bounds are given per scenario.
+    @see solvers.SolverResult
+    @see mazeModel.py
+    """
+    values: np.ndarray
+    actions: np.ndarray
+    sweeps: np.ndarray
+    backups: int
+    deltas: np.ndarray
+    wall_time: float
+    error_bounds: np.ndarray
+
+
+def batched_value_iteration(
+    maze: BaseMaze,
+    rewards: np.ndarray,
+    threshold: float,
+    discount: float,
+    probability: float=1.0,
+    callback: Callable[[int, np.ndarray], None]=None,
+    dtype: np.dtype=np.float64
+)-> BatchResult:
+    """
+    Value iteration for many reward scenarios of the same maze at once.
+
+    The layout, boundary rules and terminal cells of `maze` are
+    compiled once, and every sweep backs up all scenarios together on
+    a (K, N) value array, so the gathers over the successor table are
+    shared by the whole batch. A scenario stops as soon as its own
+    largest change in value drops below `threshold`, or below rounding
+    noise, and is left out of the following sweeps. This gives the
+    exact same result as solving every scenario with
+    `solvers.value_iteration`.
+
+    @param maze: maze with the layout and terminal cells.
+    @param rewards: (K, W, H) reward matrix of every scenario.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param probability: probability for any given action to succeed
+    @param callback: called with the sweep number and the (K,) deltas of
+    the last sweep after every sweep, if given. Converged scenarios keep
+    their last delta.
+    @param dtype: floating point type of the values and rewards.
+
+    @return BatchResult with the optimal values and actions of every
+    scenario
+    """
+    rewards = np.asarray(rewards)
+    if rewards.ndim != 3 or rewards.shape[1:] != maze.grid_shape:
+        raise AttributeError(
+            f"`rewards` does not have the correct shape."
+            f" Expected (K, {maze.grid_shape[0]}, {maze.grid_shape[1]}),"
+            f" got {rewards.shape}."
+        )
+    start_time = time.perf_counter()
+    model = maze.compile(probability, False, dtype)
+    n_scenarios = rewards.shape[0]
+    n_states = model.n_states
+
+    # values are kept state-major, as (N + 1, K), such that the gather
+    # over the successor table copies a contiguous row of scenarios for
+    # every destination. The extra last row stays 0, and is where the
+    # invalid actions point to.
+    successors = np.where(model.valid, model.successors, n_states).T
+    keep = (model.success - model.slip)[:, None]
+    slip = model.slip[:, None]
+    action_mask = np.where(
+        model.valid & ~model.terminal[:, None], 0.0, float("-inf")
+    ).T.astype(dtype)[:, :, None]
+    padded_rewards = np.zeros((n_states + 1, n_scenarios), dtype)
+    padded_rewards[:-1] = rewards.reshape(n_scenarios, n_states).T
+    # (4, N, K) rewards of every destination, 0 if invalid
+    destination_rewards = padded_rewards[successors]
+    del padded_rewards
+
+    def action_values(
+        padded_values: np.ndarray,
+        destination_rewards: np.ndarray
+    )-> np.ndarray:
+        """
+        Action-major bellman backup of a batch of scenarios.
+
+        @param padded_values: (N + 1, k) values of the scenarios.
+        @param destination_rewards: (4, N, k) destination rewards of
+        the scenarios.
+
+        @return np.ndarray with (4, N, k) action values
+        """
+        returns = padded_values[successors]
+        returns *= discount
+        returns += destination_rewards
+        total_returns = returns.sum(axis=0)
+        # (P - slip) * return + slip * sum(all returns)
+        returns *= keep
+        total_returns *= slip
+        returns += total_returns
+        returns += action_mask
+        return returns
+
+    values = np.zeros((n_states + 1, n_scenarios), dtype)
+    sweeps = np.zeros(n_scenarios, dtype=int)
+    deltas = np.full(n_scenarios, float("inf"))
+    # the values and rewards of the scenarios that did not converge yet
+    active = np.arange(n_scenarios)
+    active_values = values.copy()
+    active_rewards = destination_rewards
+    sweep = 0
+
+    while active.size > 0:
+        new_values = action_values(active_values, active_rewards).max(axis=0)
+        new_values[model.terminal] = 0.0
+        active_deltas = np.max(
+            np.abs(new_values - active_values[:-1]),
+            axis=0,
+            initial=0.0
+        )
+        active_values[:-1] = new_values
+        deltas[active] = active_deltas
+        sweeps[active] += 1
+        sweep += 1
+
+        unconverged = (active_deltas >= threshold) & \
+            (active_deltas > precision_floor(new_values, 0))
+        if not unconverged.all():
+            # freeze the converged scenarios, and leave them out of the
+            # following sweeps
+            values[:, active] = active_values
+            active = active[unconverged]
+            active_values = active_values[:, unconverged]
+            active_rewards = active_rewards[:, :, unconverged]
+
+        if callback is not None:
+            callback(sweep, deltas)
+
+    actions = action_values(values, destination_rewards).argmax(axis=0)
+    actions[model.terminal] = -1
+    if discount < 1.0:
+        error_bounds = deltas * discount / (1.0 - discount)
+    else:
+        error_bounds = np.full(n_scenarios, float("inf"))
+    return BatchResult(
+        np.ascontiguousarray(values[:-1].T),
+        np.ascontiguousarray(actions.T),
+        sweeps,
+        int(sweeps.sum()) * n_states,
+        deltas,
+        time.perf_counter() - start_time,
+        error_bounds
+    )
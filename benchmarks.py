@@ -0,0 +1,548 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+import numpy as np
+
+from baseMaze import BaseMaze
+from optimalPolicy import OptimalPolicy
+from probabilityAgent import ProbabilityAgent
+from stupidMaze import StupidMaze
+
+
+# Version of the format written by `save_results`.
+FORMAT_VERSION = 2
+SIZES = (4, 16, 64, 256, 1000, 2000)
+QUICK_SIZES = (4, 16, 64, 256)
+PROBABILITIES = (1.0, 0.7)
+MAZE_CLASSES = (BaseMaze, StupidMaze)
+# Largest maze size every solver backend, and the episodes, are run on,
+# such that the full suite finishes in a few minutes.
+MAX_SOLVE_SIZES = {"python": 32, "numpy": 1000, "stencil": 2000}
+MAX_EPISODE_SIZE = 256
+THRESHOLD = 0.01
+DISCOUNT = 0.9
+N_DESTINATION_CALLS = 2000
+N_EPISODES = 20
+SEED = 0
+# Smallest number of timed runs of every case, after the warm-up run.
+MIN_RUNS = 3
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    BenchmarkCase class
+
+    This class holds a single benchmark. `setup` prepares everything
+    that should not be timed, and returns the function to time, which
+    returns the number of units of work it did.
+    """
+    name: str
+    unit: str
+    setup: Callable[[], Callable[[], int]]
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    BenchmarkResult class
+
+    This class holds the outcome of a single benchmark. The seconds are
+    the median of all timed runs, the throughput is the work done per
+    second of that median, and the peak memory is the largest number of
+    bytes allocated at once during a run (None if not measured).
+    """
+    seconds: float
+    throughput: float
+    unit: str
+    runs: int
+    peak_memory: int=None
+
+
+def random_maze(
+    maze_class: type[BaseMaze],
+    size: int,
+    seed: int=SEED
+)-> BaseMaze:
+    """
+    Square maze with random rewards and about 1% terminal cells.
+
+    @param maze_class: maze class to create.
+    @param size: width and height of the maze.
+    @param seed: seed for the random number generator.
+
+    @return BaseMaze, or subclass, with random rewards and terminals
+    """
+    rng = np.random.default_rng(seed)
+    maze = maze_class(
+        (size, size),
+        rng.integers(-5, 10, (size, size)).astype(float)
+    )
+    for x, y in rng.integers(0, size, (max(1, size * size // 100), 2)):
+        maze.set_terminal((int(x), int(y)))
+    return maze
+
+
+def benchmark_cases(
+    sizes: list[int],
+    probabilities: list[float]
+)-> list[BenchmarkCase]:
+    """
+    All benchmark cases for the given maze sizes and probabilities.
+
+    Every size is run for construction and `get_destinations`. Solving
+    and episodes are only run up to their maximum sizes.
+    @see MAX_SOLVE_SIZES
+
+    @param sizes: width and height of the mazes.
+    @param probabilities: probabilities for any given action to succeed
+
+    @return list[BenchmarkCase] with all cases, in a fixed order
+    """
+    cases = []
+    for size in sizes:
+        for maze_class in MAZE_CLASSES:
+            cases.append(BenchmarkCase(
+                f"construction/{maze_class.__name__}/{size}x{size}",
+                "cells/s",
+                _construction_setup(maze_class, size)
+            ))
+        for maze_class in MAZE_CLASSES:
+            cases.append(BenchmarkCase(
+                f"get_destinations/{maze_class.__name__}/{size}x{size}",
+                "calls/s",
+                _destinations_setup(maze_class, size)
+            ))
+
+        for probability in probabilities:
+            for backend, max_size in MAX_SOLVE_SIZES.items():
+                if size <= max_size:
+                    cases.append(BenchmarkCase(
+                        f"solve/{backend}/{size}x{size}/p={probability}",
+                        "states/s",
+                        _solve_setup(backend, size, probability)
+                    ))
+            if size <= MAX_EPISODE_SIZE:
+                cases.append(BenchmarkCase(
+                    f"episodes/{size}x{size}/p={probability}",
+                    "steps/s",
+                    _episodes_setup(size, probability)
+                ))
+    return cases
+
+
+def _construction_setup(
+    maze_class: type[BaseMaze],
+    size: int
+)-> Callable[[], Callable[[], int]]:
+    """
+    Setup of a benchmark of the maze constructor.
+
+    @param maze_class: maze class to construct.
+    @param size: width and height of the maze.
+
+    @return Callable[[], Callable[[], int]] with the setup
+    """
+    def setup()-> Callable[[], int]:
+        rewards = np.random.default_rng(SEED).integers(
+            -5, 10, (size, size)
+        ).astype(float)
+
+        def construct()-> int:
+            maze_class((size, size), rewards)
+            return size * size
+        return construct
+    return setup
+
+
+def _destinations_setup(
+    maze_class: type[BaseMaze],
+    size: int
+)-> Callable[[], Callable[[], int]]:
+    """
+    Setup of a benchmark of `get_destinations`, on random cells.
+
+    @param maze_class: maze class to query.
+    @param size: width and height of the maze.
+
+    @return Callable[[], Callable[[], int]] with the setup
+    """
+    def setup()-> Callable[[], int]:
+        maze = random_maze(maze_class, size)
+        rng = np.random.default_rng(SEED)
+        states = [
+            maze.state_at((int(x), int(y)))
+            for x, y in rng.integers(0, size, (N_DESTINATION_CALLS, 2))
+        ]
+
+        def get_destinations()-> int:
+            for state in states:
+                maze.get_destinations(state)
+            return len(states)
+        return get_destinations
+    return setup
+
+
+def _solve_setup(
+    backend: str,
+    size: int,
+    probability: float
+)-> Callable[[], Callable[[], int]]:
+    """
+    Setup of a benchmark of solving a maze with `OptimalPolicy`.
+
+    @param backend: one of `optimalPolicy.BACKENDS`
+    @param size: width and height of the maze.
+    @param probability: probability for any given action to succeed
+
+    @return Callable[[], Callable[[], int]] with the setup
+    """
+    def setup()-> Callable[[], int]:
+        maze = random_maze(BaseMaze, size)
+
+        def solve()-> int:
+            OptimalPolicy(
+                maze,
+                THRESHOLD,
+                DISCOUNT,
+                probability,
+                False,
+                backend
+            )
+            return size * size
+        return solve
+    return setup
+
+
+def _episodes_setup(
+    size: int,
+    probability: float
+)-> Callable[[], Callable[[], int]]:
+    """
+    Setup of a benchmark of `ProbabilityAgent` episodes.
+
+    The agents follow an optimal policy. Every episode starts at a
+    random cell, and lasts until a terminal cell is reached, or for at
+    most 4 * size steps. The agents are seeded, so every run takes
+    the same steps.
+
+    @param size: width and height of the maze.
+    @param probability: probability for any given action to succeed
+
+    @return Callable[[], Callable[[], int]] with the setup
+    """
+    def setup()-> Callable[[], int]:
+        maze = random_maze(BaseMaze, size)
+        policy = OptimalPolicy(
+            maze,
+            THRESHOLD,
+            DISCOUNT,
+            probability,
+            False,
+            "numpy"
+        )
+        rng = np.random.default_rng(SEED)
+        starts = [
+            (int(x), int(y))
+            for x, y in rng.integers(0, size, (N_EPISODES, 2))
+        ]
+
+        def play()-> int:
+            random.seed(SEED)
+            steps = 0
+            for start in starts:
+                agent = ProbabilityAgent(maze, policy, start, probability)
+                for _ in range(4 * size):
+                    if maze.terminals[agent.current_coordinate]:
+                        break
+                    agent.act()
+                    steps += 1
+            return steps
+        return play
+    return setup
+
+
+def run_case(
+    case: BenchmarkCase,
+    min_time: float=0.2,
+    max_runs: int=1000,
+    measure_memory: bool=True,
+    min_runs: int=MIN_RUNS
+)-> BenchmarkResult:
+    """
+    Time a single benchmark case.
+
+    The first run is a warm-up, which is not timed, and measures the
+    peak memory, as tracing allocations slows it down. After that, the
+    case is run at least `min_runs` times, and until it took `min_time`
+    seconds in total, or `max_runs` times. The median of the timed runs
+    is kept, such that a single slow or fast run does not decide the
+    result.
+
+    @param case: benchmark case to run.
+    @param min_time: minimum total number of seconds to run for.
+    @param max_runs: maximum number of timed runs.
+    @param measure_memory: measure the peak memory, if True.
+    @param min_runs: minimum number of timed runs.
+
+    @return BenchmarkResult with median time and peak memory
+    """
+    function = case.setup()
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    else:
+        function()
+
+    times = []
+    while len(times) < min_runs or (
+        sum(times) < min_time and len(times) < max_runs
+    ):
+        start_time = time.perf_counter()
+        work = function()
+        times.append(time.perf_counter() - start_time)
+
+    seconds = float(np.median(times))
+    return BenchmarkResult(
+        seconds,
+        work / max(seconds, 1e-9),
+        case.unit,
+        len(times),
+        peak_memory
+    )
+
+
+def run_benchmarks(
+    sizes: list[int]=SIZES,
+    probabilities: list[float]=PROBABILITIES,
+    min_time: float=0.2,
+    measure_memory: bool=True,
+    verbose: bool=True
+)-> dict:
+    """
+    Run every benchmark case.
+
+    @param sizes: width and height of the mazes.
+    @param probabilities: probabilities for any given action to succeed
+    @param min_time: minimum number of seconds to time every case for.
+    @param measure_memory: measure the peak memory, if True.
+    @param verbose: print every result as soon as it is known, if True.
+
+    @return dict with the settings, environment and the result of
+    every case, by name, as written by `save_results`
+    """
+    results = {}
+    for case in benchmark_cases(sizes, probabilities):
+        result = run_case(case, min_time, 1000, measure_memory)
+        results[case.name] = asdict(result)
+        if verbose:
+            print(_format_result(case.name, result), flush=True)
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "settings": {
+            "sizes": list(sizes),
+            "probabilities": list(probabilities),
+            "min_time": min_time,
+            "measure_memory": measure_memory
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "system": platform.platform()
+        },
+        "results": results
+    }
+
+
+def _format_result(name: str, result: BenchmarkResult)-> str:
+    """
+    Stringify a single benchmark result.
+
+    @param name: name of the case.
+    @param result: result of the case.
+
+    @return str with name, time, throughput and peak memory
+    """
+    memory = "" if result.peak_memory is None else \
+        f"{result.peak_memory / 2**20:10.1f} MiB"
+    return (
+        f"{name:<42} {result.seconds:10.4f} s"
+        f" {result.throughput:14.4g} {result.unit:<9}{memory}"
+    )
+
+
+def save_results(results: dict, path: str)-> None:
+    """
+    Save benchmark results as JSON.
+
+    @param results: results, as returned by `run_benchmarks`.
+    @param path: file to write to.
+    """
+    with open(path, "w") as file:
+        json.dump(results, file, indent=4)
+
+
+def load_results(path: str)-> dict:
+    """
+    Load benchmark results saved by `save_results`.
+
+    @param path: file to read from.
+
+    @return dict with the benchmark results
+    """
+    with open(path) as file:
+        results = json.load(file)
+    if results.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark format version"
+            f" {results.get('format_version')}, expected {FORMAT_VERSION}."
+        )
+    return results
+
+
+def compare_results(
+    baseline: dict,
+    results: dict,
+    tolerance: float=0.2,
+    memory_slack: int=2**20
+)-> list[str]:
+    """
+    Find the cases that got slower, or use more memory, than before.
+
+    The throughputs are those of the median runs, see `run_case`.
+    A case is flagged if its throughput dropped by more than
+    `tolerance`, or if its peak memory grew by more than `tolerance`
+    and more than `memory_slack` bytes. Cases that are only in one of
+    the results are ignored.
+
+    @param baseline: earlier results, as returned by `run_benchmarks`.
+    @param results: new results, as returned by `run_benchmarks`.
+    @param tolerance: allowed relative change.
+    @param memory_slack: allowed absolute growth of the peak memory.
+
+    @return list[str] with a description of every regression
+    """
+    regressions = []
+    for name, old in baseline["results"].items():
+        new = results["results"].get(name)
+        if new is None:
+            continue
+        if new["throughput"] < old["throughput"] * (1.0 - tolerance):
+            regressions.append(
+                f"{name}: throughput dropped from"
+                f" {old['throughput']:.4g} to {new['throughput']:.4g}"
+                f" {new['unit']}"
+                f" ({new['throughput'] / old['throughput'] - 1.0:+.1%})"
+            )
+        if old["peak_memory"] is not None and \
+                new["peak_memory"] is not None and \
+                new["peak_memory"] > old["peak_memory"] * (1.0 + tolerance) \
+                and new["peak_memory"] - old["peak_memory"] > memory_slack:
+            regressions.append(
+                f"{name}: peak memory grew from"
+                f" {old['peak_memory'] / 2**20:.1f} MiB to"
+                f" {new['peak_memory'] / 2**20:.1f} MiB"
+            )
+    return regressions
+
+
+def main(arguments: list[str]=None)-> int:
+    """
+    Command line interface of the benchmark suite.
+
+    `python benchmarks.py run` runs the benchmarks and writes the
+    results to a JSON baseline. `python benchmarks.py compare` runs the
+    benchmarks with the settings of a baseline, and reports every
+    regression. It exits with 1 if there are any.
+
+    @param arguments: command line arguments, `sys.argv` if None.
+
+    @return int with exit code
+    """
+    parser = argparse.ArgumentParser(description=(
+        "Benchmark maze construction, get_destinations, solving"
+        " and ProbabilityAgent episodes."
+    ))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="record a baseline")
+    run_parser.add_argument("--output", default="benchmarks.json")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=None)
+    run_parser.add_argument(
+        "--quick",
+        action="store_true",
+        help=f"only run sizes {QUICK_SIZES}"
+    )
+    run_parser.add_argument(
+        "--probabilities",
+        type=float,
+        nargs="+",
+        default=list(PROBABILITIES)
+    )
+
+    compare_parser = commands.add_parser(
+        "compare",
+        help="compare against a baseline"
+    )
+    compare_parser.add_argument("--baseline", default="benchmarks.json")
+    compare_parser.add_argument("--output", default=None)
+    compare_parser.add_argument("--tolerance", type=float, default=0.2)
+
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument("--min-time", type=float, default=None)
+        command_parser.add_argument("--skip-memory", action="store_true")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == "run":
+        sizes = arguments.sizes or (QUICK_SIZES if arguments.quick else SIZES)
+        results = run_benchmarks(
+            sizes,
+            arguments.probabilities,
+            0.2 if arguments.min_time is None else arguments.min_time,
+            not arguments.skip_memory
+        )
+        save_results(results, arguments.output)
+        print(f"Saved results to {arguments.output}.")
+        return 0
+
+    baseline = load_results(arguments.baseline)
+    settings = baseline["settings"]
+    results = run_benchmarks(
+        settings["sizes"],
+        settings["probabilities"],
+        settings["min_time"] if arguments.min_time is None \
+            else arguments.min_time,
+        settings["measure_memory"] and not arguments.skip_memory
+    )
+    if arguments.output is not None:
+        save_results(results, arguments.output)
+
+    regressions = compare_results(baseline, results, arguments.tolerance)
+    if not regressions:
+        print(f"No regressions against {arguments.baseline}.")
+        return 0
+    print(f"\033[31m{len(regressions)} regression(s) against"
+          f" {arguments.baseline}:\033[0m")
+    for regression in regressions:
+        print(f"- {regression}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,90 @@
+import functools
 import inspect
+import os
 
 from dataclasses import dataclass
-from typing import Annotated, get_type_hints
+from typing import Callable, get_type_hints
 
 
-def check_annotated(func)-> None:
+# Setting the environment variable MAZE_NO_VALIDATION, before this module
+# is imported, strips validation entirely: `check_annotated` then returns
+# the functions unchanged, without any overhead. Empty values, and values
+# that mean false, such as "0" or "false", keep validation.
+FALSE_VALUES = ("", "0", "false", "no", "off")
+VALIDATION_STRIPPED = os.environ.get(
+    "MAZE_NO_VALIDATION", ""
+).strip().lower() not in FALSE_VALUES
+_validation_enabled = True
+
+
+def set_validation(enabled: bool)-> None:
+    """
+    Switch validation of annotated arguments on or off at runtime.
+
+    Functions that were decorated while validation was stripped are
+    never validated, whatever this switch says.
+    @see VALIDATION_STRIPPED
+
+    @param enabled: validate arguments if True.
+    """
+    global _validation_enabled
+    _validation_enabled = enabled
+
+
+def check_annotated(func: Callable)-> Callable:
     """
     Checker wrapper function to force type annotations.
 
+    The validators of every annotated parameter are looked up once,
+    together with the position of the parameter, such that a call only
+    checks the arguments that have validators. Arguments can be passed
+    by position or by keyword, in any order. Defaults are not checked,
+    as they are part of the function definition.
+
     @param func: function to wrap around
+
+    @return Callable with validating wrapper, or `func` itself if
+    validation is stripped
     """
+    if VALIDATION_STRIPPED:
+        return func
+
     hints = get_type_hints(func, include_extras=True)
-    spec = inspect.getfullargspec(func)
+    # (name, position or None if keyword-only, validators)
+    plan = []
+    positional = True
+    for index, parameter in enumerate(
+        inspect.signature(func).parameters.values()
+    ):
+        if parameter.kind in (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.KEYWORD_ONLY
+        ):
+            positional = False
+        validators = getattr(hints.get(parameter.name), "__metadata__", ())
+        if validators and parameter.kind not in (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.VAR_KEYWORD
+        ):
+            plan.append((
+                parameter.name,
+                index if positional else None,
+                tuple(validators)
+            ))
+    plan = tuple(plan)
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        arguments = list(args) + list(kwargs.values())
-        for idx, arg_name in enumerate(spec[0]):
-            hint = hints.get(arg_name)
-            validators = getattr(hint, '__metadata__', None)
-            if not validators:
-                continue
-            for validator in validators:
-                validator.validate_value(arguments[idx])
+        if _validation_enabled:
+            for name, index, validators in plan:
+                if index is not None and index < len(args):
+                    value = args[index]
+                elif name in kwargs:
+                    value = kwargs[name]
+                else:
+                    continue
+                for validator in validators:
+                    validator.validate_value(value)
         return func(*args, **kwargs)
     return wrapper
 
@@ -0,0 +1,333 @@
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+from action import ACTIONS
+
+# scipy is only imported when a policy matrix is built, such that plain
+# value iteration does not load it
+if TYPE_CHECKING:
+    import scipy.sparse
+
+
+class MazeModel:
+    """
+    MazeModel class.
+
+    A maze model is a compiled, integer-indexed version of a maze MDP.
+    @see baseMaze.py
+
+    States are numbered in row-major order of the maze grid, meaning the
+    state on coordinate (x, y) gets index `x * grid_shape[1] + y`.
+    Actions are numbered in the order of `ACTIONS`.
+    @see action.py
+
+    The slip model of the `ProbabilityAgent` is baked into the model:
+    the desired action succeeds with chance `probability`, and the
+    left-over probability is shared equally by all other valid actions.
+    """
+
+    def __init__(
+        self,
+        grid_shape: tuple[int, int],
+        successors: np.ndarray,
+        rewards: np.ndarray,
+        terminal: np.ndarray,
+        probability: float=1.0,
+        dtype: np.dtype=np.float64
+    )-> None:
+        """
+        @var $grid_shape
+        **tuple[int, int]** Shape of the compiled maze.
+        @var $successors
+        **np.ndarray** (N, 4) matrix with the destination index for
+        every state and action, -1 if the action is invalid.
+        @var $valid
+        **np.ndarray** (N, 4) boolean mask of valid actions.
+        @var $rewards
+        **np.ndarray** (N,) reward for entering every state.
+        @var $terminal
+        **np.ndarray** (N,) boolean mask of terminal states.
+        @var $probability
+        **float** Chance for any given action to succeed.
+        @var $success
+        **np.ndarray** (N,) chance for the desired action to succeed.
+        @var $slip
+        **np.ndarray** (N,) chance of ending up at the destination of
+        one specific other valid action, when the desired one fails.
+        @var $dtype
+        **np.dtype** Floating point type of all values and rewards.
+        """
+        self.grid_shape = grid_shape
+        # stored action-major, such that every action is contiguous
+        self.successors = np.asfortranarray(successors)
+        self.valid = self.successors >= 0
+        self.dtype = np.dtype(dtype)
+        self.rewards = rewards.astype(self.dtype, copy=False)
+        self.terminal = terminal
+        self.probability = probability
+
+        # (1-P)/n_alternatives, where a state with a single valid action
+        # has no alternative to slip into, so its action always succeeds
+        n_alternatives = self.valid.sum(axis=1) - 1
+        self.success = np.where(n_alternatives > 0, probability, 1.0)
+        self.slip = np.where(
+            n_alternatives > 0,
+            (1.0 - probability) / np.maximum(n_alternatives, 1),
+            0.0
+        )
+        self.success = self.success.astype(self.dtype)
+        self.slip = self.slip.astype(self.dtype)
+
+        # precomputed per sweep constants, all with shape (4, N):
+        # rewards of every destination (0 if invalid)
+        # and -inf for actions that can not be taken
+        self._destination_rewards = np.where(
+            self.valid, self.rewards[self.successors], 0.0
+        ).T.astype(self.dtype)
+        self._action_mask = np.where(
+            self.valid & ~terminal[:, None], 0.0, float("-inf")
+        ).T.astype(self.dtype)
+        self._terminal_states = np.flatnonzero(terminal)
+
+    @property
+    def n_states(self)-> int:
+        """
+        Number of states in the model.
+
+        @return int with number of states
+        """
+        return self.successors.shape[0]
+
+    def astype(self, dtype: np.dtype)-> "MazeModel":
+        """
+        Copy of the model, with another floating point type.
+
+        @param dtype: floating point type of the copy.
+
+        @return MazeModel, or subclass, with given dtype
+        """
+        return type(self)(
+            self.grid_shape,
+            self.successors,
+            self.rewards,
+            self.terminal,
+            self.probability,
+            dtype
+        )
+
+    def outcome_probabilities(self)-> np.ndarray:
+        """
+        Outcome probabilities for every state and desired action.
+
+        Entry [s, a, b] is the chance that the agent ends up performing
+        action b, when it desires to perform action a in state s.
+        Terminal states and invalid desired actions have no outcomes.
+
+        @return np.ndarray with (N, 4, 4) outcome probabilities
+        """
+        n_actions = len(ACTIONS)
+        outcomes = self.slip[:, None, None] * self.valid[:, None, :] \
+            * (1.0 - np.eye(n_actions))
+        outcomes += self.success[:, None, None] * np.eye(n_actions)
+        outcomes *= self.valid[:, :, None]
+        outcomes[self.terminal] = 0.0
+        return outcomes
+
+    def transition_tensor(self)-> np.ndarray:
+        """
+        Dense transition tensor of the model.
+
+        NOTE: memory grows quadratically with the number of states,
+        so this is only meant for small mazes.
+
+        @return np.ndarray with P[s, a, s'] for every state, action and
+        destination state
+        """
+        outcomes = self.outcome_probabilities()
+        transitions = np.zeros(
+            (self.n_states, len(ACTIONS), self.n_states)
+        )
+        states, actions, outcome_actions = np.nonzero(outcomes)
+        np.add.at(
+            transitions,
+            (states, actions, self.successors[states, outcome_actions]),
+            outcomes[states, actions, outcome_actions]
+        )
+        return transitions
+
+    def _destination_returns(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Return for ending up in the destination of every action.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with (4, N) r(s') + discount * V(s') for the
+        destination of every action, 0 for invalid actions
+        """
+        # invalid actions have successor -1, which picks the appended 0
+        destination_returns = np.append(
+            values, 
+            self.dtype.type(0.0)
+        )[self.successors.T]
+        destination_returns *= discount
+        destination_returns += self._destination_rewards
+        return destination_returns
+
+    def _action_values(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Action-major bellman backup.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with (4, N) action values
+        """
+        destination_returns = self._destination_returns(values, discount)
+        total_returns = destination_returns.sum(axis=0)
+
+        # P * (r + \gamma * V(destination)) +
+        # (1-P)/n_alternatives * sum(r + \gamma * V(alternatives)),
+        # rewritten as (P - slip) * return + slip * sum(all returns)
+        action_values = destination_returns
+        action_values *= self.success - self.slip
+        action_values += self.slip * total_returns
+        action_values += self._action_mask
+        return action_values
+
+    def action_values(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Calculate the value of every action in every state.
+
+        This performs the bellman backup
+        Q(s, a) = sum_s' p(s' | s, a) * [r(s') + discount * V(s')]
+        for all states at once.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with (N, 4) action values, -inf for invalid
+        actions and for every action in a terminal state
+        """
+        return self._action_values(values, discount).T
+
+    def backup(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Bellman optimality backup of all states.
+
+        Terminal states get a value of 0.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with the new (N,) values
+        """
+        new_values = self._action_values(values, discount).max(axis=0)
+        new_values[self._terminal_states] = 0.0
+        return new_values
+
+    def policy_matrix(
+        self,
+        policy: np.ndarray
+    )-> "scipy.sparse.csr_matrix":
+        """
+        Sparse transition matrix when following a fixed policy.
+
+        Every row has at most four entries, so applying the matrix is
+        much cheaper than a full bellman backup.
+
+        @param policy: (N,) vector with the action index for every
+        state. Ignored for terminal states.
+
+        @return scipy.sparse.csr_matrix with (N, N) p(s' | s, policy(s))
+        """
+        import scipy.sparse
+
+        # every valid action is performed with `slip`,
+        # the desired action with `success` instead
+        states = np.arange(self.n_states)
+        weights = self.slip * self.valid.T
+        weights[policy, states] += self.success - self.slip
+        weights[:, self.terminal] = 0.0
+
+        actions, origins = np.nonzero(weights)
+        # duplicate entries, as in a StupidMaze corner, are summed
+        return scipy.sparse.csr_matrix(
+            (
+                weights[actions, origins],
+                (origins, self.successors[origins, actions])
+            ),
+            shape=(self.n_states, self.n_states)
+        )
+
+    def policy_backup(
+        self,
+        values: np.ndarray,
+        policy: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Bellman backup of all states, following a fixed policy.
+
+        Only the value of the chosen action is calculated, which makes
+        this cheaper than `backup`. Terminal states get a value of 0.
+
+        @param values: (N,) vector with current value of each state.
+        @param policy: (N,) vector with the action index for every
+        state. Ignored for terminal states.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with the new (N,) values
+        """
+        destination_returns = self._destination_returns(values, discount)
+        new_values = self.slip * destination_returns.sum(axis=0)
+        new_values += (self.success - self.slip) * \
+            destination_returns.ravel()[
+                np.maximum(policy, 0) * self.n_states + \
+                np.arange(self.n_states)
+            ]
+        new_values[self._terminal_states] = 0.0
+        return new_values
+
+    def greedy(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> tuple[np.ndarray, np.ndarray]:
+        """
+        Greedy backup of all states.
+
+        Terminal states get a value of 0 and an action index of -1.
+        Ties are broken in favour of the first action in `ACTIONS`.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return tuple[np.ndarray, np.ndarray] with the new (N,) values
+        and the (N,) indices of the best actions
+        """
+        action_values = self._action_values(values, discount)
+        best_actions = action_values.argmax(axis=0)
+        best_values = np.take_along_axis(
+            action_values, best_actions[None], axis=0
+        )[0]
+        best_values[self._terminal_states] = 0.0
+        best_actions[self._terminal_states] = -1
+        return best_values, best_actions
@@ -0,0 +1,238 @@
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Annotated
+
+import numpy as np
+
+from baseMaze import BaseMaze
+from basePolicy import BasePolicy
+from floatRange import FloatRange, check_annotated
+from optimalPolicy import OptimalPolicy
+from rolloutEngine import RolloutEngine
+from solvers import evaluate_policy
+
+
+@dataclass
+class MonteCarloEstimate:
+    """
+    MonteCarloEstimate class
+
+    This class holds the estimated expected return and episode length,
+    both with a (low, high) confidence interval.
+    """
+    mean_return: float
+    return_interval: tuple[float, float]
+    mean_length: float
+    length_interval: tuple[float, float]
+    n_episodes: int
+    terminated_fraction: float
+
+    def covers(self, value: float)-> bool:
+        """
+        Check whether `value` lies in the return confidence interval.
+
+        @param value: expected return to check.
+
+        @return bool with True if `value` is inside of the interval
+        """
+        return self.return_interval[0] <= value <= self.return_interval[1]
+
+
+class MonteCarloEvaluator:
+    """
+    MonteCarloEvaluator class.
+
+    This evaluator estimates the expected return and episode length of a
+    `Policy`, by letting batches of `ProbabilityAgent`s play episodes.
+    @see rolloutEngine.py
+
+    Instead of playing a fixed number of episodes, batches are played
+    until the confidence interval of the expected return is at most
+    `target_width` wide.
+    """
+
+    @check_annotated
+    def __init__(
+        self,
+        maze: BaseMaze,
+        policy: BasePolicy,
+        probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
+        discount: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
+        confidence: Annotated[float, FloatRange(0.0, 1.0)]=0.95
+    )-> None:
+        """
+        @var $engine
+        **RolloutEngine** engine that plays the episodes.
+        @var $confidence
+        **float** Confidence level of the reported intervals.
+        @var $z_score
+        **float** Two-sided normal critical value for `confidence`.
+        """
+        if not confidence < 1.0:
+            raise ValueError(f"{confidence} must be smaller than 1.0.")
+        self.engine = RolloutEngine(maze, policy, probability, discount)
+        self.confidence = confidence
+        self.z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def evaluate(
+        self,
+        start_coordinate: tuple[int, int],
+        target_width: float,
+        batch_size: int=1000,
+        max_episodes: int=1_000_000,
+        max_steps: int=None,
+        seed: int=None
+    )-> MonteCarloEstimate:
+        """
+        Estimate the expected return from `start_coordinate`.
+
+        Running means and variances are merged per batch, so memory
+        does not grow with the number of episodes.
+
+        @param start_coordinate: x, y coordinate to start from.
+        @param target_width: width of the return interval to stop at.
+        @param batch_size: number of episodes played at once.
+        @param max_episodes: stop after this many episodes, even if the
+        interval is still wider than `target_width`.
+        @param max_steps: maximum length of an episode, the horizon of
+        the engine if None. Episodes that are cut off count as not
+        terminated.
+        @see rolloutEngine.RolloutEngine.horizon
+        @param seed: seed for the random number generator.
+
+        @return MonteCarloEstimate with estimated return and length
+        """
+        rng = np.random.default_rng(seed)
+        # episode count, means and sums of squared deviations,
+        # for the returns and the lengths
+        count = 0
+        means = np.zeros(2)
+        squares = np.zeros(2)
+        terminated = 0
+
+        while count < max_episodes:
+            result = self.engine.run(
+                start_coordinate,
+                min(batch_size, max_episodes - count),
+                max_steps,
+                rng
+            )
+            samples = np.stack((result.returns, result.lengths))
+            size = samples.shape[1]
+            batch_means = samples.mean(axis=1)
+
+            # merge batch into the running statistics (Chan et al.)
+            difference = batch_means - means
+            total = count + size
+            squares += ((samples - batch_means[:, None])**2).sum(axis=1) + \
+                difference**2 * count * size / total
+            means += difference * size / total
+            count = total
+            terminated += int(result.terminated.sum())
+
+            if count > 1 and self._half_widths(count, squares)[0] * 2 \
+                    <= target_width:
+                break
+
+        half_widths = self._half_widths(count, squares)
+        return MonteCarloEstimate(
+            float(means[0]),
+            (
+                float(means[0] - half_widths[0]),
+                float(means[0] + half_widths[0])
+            ),
+            float(means[1]),
+            (
+                float(means[1] - half_widths[1]),
+                float(means[1] + half_widths[1])
+            ),
+            count,
+            terminated / count
+        )
+
+    def _half_widths(self, count: int, squares: np.ndarray)-> np.ndarray:
+        """
+        Half widths of the confidence intervals of the means.
+
+        @param count: number of samples.
+        @param squares: sums of squared deviations from the means.
+
+        @return np.ndarray with half width of every interval
+        """
+        if count < 2:
+            return np.full(squares.shape, float("inf"))
+        return self.z_score * np.sqrt(squares / (count - 1) / count)
+
+    def expected_return(self, start_coordinate: tuple[int, int])-> float:
+        """
+        Exact expected return of the policy from `start_coordinate`.
+
+        An `OptimalPolicy` that was solved with a compiled backend, on
+        the unchanged maze of this evaluator, with the same probability
+        and discount, already holds its values. Any other policy with a
+        fixed action per state, including an `OptimalPolicy` of another
+        MDP, is evaluated exactly on the compiled maze, with the
+        probability and discount of this evaluator.
+        @see basePolicy.BasePolicy.action_table
+        @see solvers.evaluate_policy
+
+        @param start_coordinate: x, y coordinate to start from.
+
+        @return float with expected return
+        """
+        engine = self.engine
+        index = engine.maze.flat_index(start_coordinate)
+        policy = engine.policy
+        if isinstance(policy, OptimalPolicy) and \
+                policy.result is not None and \
+                policy.maze is engine.maze and \
+                policy.maze_version == engine.maze.version and \
+                policy.probability == engine.probability and \
+                policy.discount == engine.discount:
+            return float(policy.result.values[index])
+
+        if engine.actions is None:
+            raise ValueError(
+                f"{type(policy).__name__} has no fixed action per"
+                " state, so its expected return can not be calculated."
+            )
+        if np.any((engine.actions < 0) & ~engine.model.terminal):
+            raise ValueError(
+                f"{type(policy).__name__} gets stuck in some non-terminal"
+                " states, so its expected return can not be calculated."
+            )
+        return float(evaluate_policy(
+            engine.model,
+            engine.actions,
+            engine.discount
+        )[index])
+
+    def compare(
+        self,
+        start_coordinate: tuple[int, int],
+        target_width: float,
+        batch_size: int=1000,
+        max_episodes: int=1_000_000,
+        max_steps: int=None,
+        seed: int=None
+    )-> tuple[MonteCarloEstimate, float]:
+        """
+        Compare the empirical return with the expected return.
+
+        @see evaluate
+        @see expected_return
+
+        @return tuple[MonteCarloEstimate, float] with the estimate and
+        the expected return, which the estimate should cover
+        """
+        return (
+            self.evaluate(
+                start_coordinate,
+                target_width,
+                batch_size,
+                max_episodes,
+                max_steps,
+                seed
+            ),
+            self.expected_return(start_coordinate)
+        )
@@ -1,10 +1,39 @@
+import json
+import os
+
 from typing import Annotated
 
-from action import Action
+import numpy as np
+
+from action import Action, ACTIONS, ACTION_INDICES
 from basePolicy import BasePolicy
 from floatRange import FloatRange, check_annotated
+from parallelSolver import parallel_value_iteration
+from tiledSolver import MEMORY_BUDGET, tiled_value_iteration
 from baseMaze import BaseMaze
+from solvers import (
+    METHODS, 
+    SolverResult, 
+    check_stopping_rule,
+    error_bound,
+    mixed_precision_value_iteration,
+    prioritized_sweeping, 
+    solve, 
+    stopping_value,
+    value_iteration
+)
 from state import State
+from stupidMaze import StupidMaze
+
+
+BACKENDS = ("python", "numpy", "sparse", "parallel", "stencil", "tiled")
+PRECISIONS = ("float64", "float32", "mixed")
+# Version of the format written by `OptimalPolicy.save`.
+FORMAT_VERSION = 2
+MAZE_CLASSES = {maze_class.__name__: maze_class for maze_class in (
+    BaseMaze, 
+    StupidMaze
+)}
         
 
 class OptimalPolicy(BasePolicy):
@@ -23,29 +52,256 @@ class OptimalPolicy(BasePolicy):
         threshold: Annotated[float, FloatRange(0.0, float("inf"))],
         discount: Annotated[float, FloatRange(0.0, 1.0)],
         probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
-        visualise: bool=False
+        visualise: bool=False,
+        backend: str="python",
+        method: str="value_iteration",
+        evaluation_depth: int=None,
+        sweep_order: str | np.ndarray="distance",
+        initial_values: np.ndarray | BasePolicy=None,
+        precision: str="float64",
+        stopping_rule: str="max_change",
+        directory: str=None,
+        memory_budget: int=MEMORY_BUDGET
     )-> None:
         """
+        The `backend` decides how the values are calculated:
+        - "python": value iteration over `State` objects.
+        - "numpy": vectorized calculations on a compiled maze.
+        - "sparse": calculations using sparse transition matrices,
+        meant for very large mazes.
+        - "parallel": vectorized calculations, spread over multiple
+        processes by blocks of rows. Values are not visualised.
+        - "stencil": vectorized calculations with shifted grids,
+        without any transition structure. The fastest option, using
+        the least memory.
+        - "tiled": out-of-core calculations, tile by tile, with the
+        values in memory-mapped files in `directory`, such that at most
+        `memory_budget` bytes are used at once. Meant for mazes larger
+        than memory, e.g. created with `BaseMaze.from_arrays` around
+        memory-mapped rewards and terminals. Values are not visualised,
+        and there is no warm start. `update` and `estimate_sweeps_saved`
+        compile the whole maze, so they do not stay out-of-core.
+        @see tiledSolver.tiled_value_iteration
+
+        The `method` decides which algorithm is used to solve the maze:
+        - "value_iteration": perform bellman backups until the values
+        change less than `threshold`.
+        - "policy_iteration": evaluate the policy exactly and improve
+        it, until the policy is stable. `threshold` is not used.
+        - "modified_policy_iteration": improve the policy and evaluate
+        it with `evaluation_depth` fixed-policy backups, until the
+        values change less than `threshold`. The depth adapts itself
+        if it is None.
+        - "gauss_seidel": value iteration that updates the values in
+        place, visiting the states in `sweep_order`.
+        - "prioritized_sweeping": back up the state with the largest
+        bellman residual first, until every residual is below
+        `threshold`. Every update also backs up the neighbours, which
+        makes it slower than "gauss_seidel" for a whole maze.
+        The "python", "parallel", "stencil" and "tiled" backends are
+        limited to "value_iteration".
+
+        Solving starts with a value of 0 for every state, unless
+        `initial_values` are given. These can be the flat values of a
+        previous solution, or a previous `OptimalPolicy` of a similar
+        maze, e.g. after small reward edits or a small discount change.
+
+        The `precision` decides the floating point type of the values:
+        - "float64": double precision.
+        - "float32": single precision, which halves the memory use and
+        traffic. Values are only accurate up to float32 rounding, which
+        is larger than `threshold` for small thresholds and big values.
+        - "mixed": converge in single precision first, then polish the
+        values in double precision, until `threshold` is reached.
+        Only "value_iteration" on the "numpy", "sparse" and "stencil"
+        backends supports a precision other than "float64".
+
+        The `stopping_rule` decides what is compared to `threshold`:
+        - "max_change": the largest change in value of a sweep.
+        - "span": the largest minus the smallest change in value.
+        - "bounded": the certified distance to the optimal values,
+        such that `threshold` is the required accuracy.
+        - "relative": the largest change, relative to the largest value.
+        Only "value_iteration" and "modified_policy_iteration" support
+        a rule other than "max_change", on every backend but "parallel"
+        and "tiled".
+        @see solvers.stopping_value
+
         @var $maze
         **Maze** with MDP information
 
         @var $actions
         **dict[state : action]** 
         dictionary with states mapping to optimal actions.  
+        None if a compiled backend was used.
+
+        @var $result
+        **SolverResult** with flat values and action indices.
+        None if the "python" backend was used.
+        @see solvers.py
+
+        @var $values
+        **dict[state : float]** 
+        dictionary with states mapping to optimal values.  
+        None if a compiled backend was used.
+
+        @var $sweeps
+        **int** Number of sweeps the "python" backend took.
+        None if a compiled backend was used, see `result.sweeps`.
+
+        @var $estimated_sweeps_saved
+        **int** Estimated number of sweeps the warm start saved,
+        compared to a cold start. The sweeps the warm start did take
+        are in `result.sweeps`, or `sweeps` for the "python" backend.
+        This is an estimate of the sweeps of a cold start, not a second,
+        cold solve. None for a cold start, and None if the discount is
+        1.0 (or 0.0), as the residuals do not shrink by a known factor
+        per sweep then. None for the "span" and "relative" stopping
+        rules, as these do not stop on a known residual.
+        @see estimate_sweeps_saved
+
+        @var $threshold
+        **float** Threshold the maze was solved with.
+        @var $discount
+        **float** Discount the maze was solved with.
+        @var $probability
+        **float** Probability the maze was solved with.
+        @var $backend
+        **str** Backend the maze was solved with.
+        @var $method
+        **str** Method the maze was solved with.
+        @var $precision
+        **str** Precision the maze was solved with.
+        @var $stopping_rule
+        **str** Stopping rule the maze was solved with.
+        @var $maze_version
+        **int** `version` of the maze the solution belongs to.
+        @see baseMaze.BaseMaze.changed_since
+        @var $error_bound
+        **float** Largest possible difference between the values and
+        the optimal values, inf if there is no discount.
+        @see solvers.error_bound
         """
         super().__init__()
 
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend {backend!r}. Expected one of {BACKENDS}."
+            )
+        if method not in METHODS:
+            raise ValueError(
+                f"Unknown method {method!r}. Expected one of {METHODS}."
+            )
+        if backend in ("python", "parallel", "stencil", "tiled") and \
+                method != "value_iteration":
+            raise ValueError(
+                f"The {backend!r} backend only supports 'value_iteration',"
+                f" got {method!r}."
+            )
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unknown precision {precision!r}."
+                f" Expected one of {PRECISIONS}."
+            )
+        if precision != "float64" and (
+            backend not in ("numpy", "sparse", "stencil") or
+            method != "value_iteration"
+        ):
+            raise ValueError(
+                f"Precision {precision!r} is only supported by"
+                " 'value_iteration' on the 'numpy', 'sparse' and"
+                f" 'stencil' backends, got {method!r} on {backend!r}."
+            )
+        check_stopping_rule(stopping_rule, discount)
+        if stopping_rule != "max_change" and (
+            backend in ("parallel", "tiled") or method not in (
+                "value_iteration",
+                "modified_policy_iteration"
+            )
+        ):
+            raise ValueError(
+                f"The {stopping_rule!r} stopping rule is not supported by"
+                f" {method!r} on {backend!r}."
+            )
+        if backend == "tiled" and directory is None:
+            raise ValueError("The 'tiled' backend needs a `directory`.")
+        if backend == "tiled" and initial_values is not None:
+            raise ValueError(
+                "The 'tiled' backend does not support `initial_values`."
+            )
+
+        if isinstance(initial_values, OptimalPolicy):
+            initial_values = initial_values.value_table()
+        if initial_values is not None:
+            initial_values = np.array(initial_values, dtype=float).ravel()
+            if initial_values.size != maze.rewards.size:
+                raise ValueError(
+                    f"Expected {maze.rewards.size} initial values,"
+                    f" got {initial_values.size}."
+                )
+            initial_values[maze.terminals.ravel()] = 0.0
+
         self.maze = maze
-        self.actions = self._determine_optimal_policy(
-            self._value_iteration(
+        self.threshold = threshold
+        self.discount = discount
+        self.probability = probability
+        self.backend = backend
+        self.method = method
+        self.precision = precision
+        self.stopping_rule = stopping_rule
+        self.maze_version = maze.version
+        if backend == "python":
+            self.result = None
+            self.values = self._value_iteration(
                 threshold, 
                 discount,
                 probability, 
-                visualise
-            ), 
-            discount,
-            probability
-        )
+                visualise,
+                initial_values,
+                stopping_rule
+            )
+            self.actions = self._determine_optimal_policy(
+                self.values, 
+                discount,
+                probability
+            )
+        else:
+            self.actions = None
+            self.values = None
+            self.sweeps = None
+            self.result = self._solve(
+                threshold,
+                discount,
+                probability,
+                visualise,
+                backend,
+                method,
+                evaluation_depth,
+                sweep_order,
+                initial_values,
+                precision,
+                stopping_rule,
+                directory,
+                memory_budget
+            )
+            self.error_bound = self.result.error_bound
+
+        self.estimated_sweeps_saved = None
+        if initial_values is not None:
+            warm_sweeps = None
+            if self.result is None:
+                warm_sweeps = self.sweeps
+            elif method == "value_iteration":
+                warm_sweeps = self.result.sweeps
+            self.estimated_sweeps_saved = self.estimate_sweeps_saved(
+                initial_values,
+                threshold,
+                discount,
+                probability,
+                warm_sweeps,
+                stopping_rule
+            )
+
         if visualise:
             print(f"\033[32m{'─'*47}\n\t\tOptimal Policy:\n{'─'*47}\033[0m")
             self.visualise(self.maze)
@@ -56,13 +312,17 @@ class OptimalPolicy(BasePolicy):
         threshold: Annotated[float, FloatRange(0.0, float("inf"))],
         discount: Annotated[float, FloatRange(0.0, 1.0)],
         probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
-        visualise: bool=False
+        visualise: bool=False,
+        initial_values: np.ndarray=None,
+        stopping_rule: str="max_change"
     )-> dict[State : float]:
         """
         Value iteration
 
         Perform bellman equation on MDP, given provided parameters,
         in order to calculate each state's value.
+        Sets `self.error_bound` of the calculated values, and the
+        number of `self.sweeps` it took.
         
         @param threshold: float greater than 0.0 with threshold for
         when to stop converging
@@ -70,14 +330,25 @@ class OptimalPolicy(BasePolicy):
         @param probability: probability for any given action to succeed
         @param visualise: print value matrix after each iteration
         if true
+        @param initial_values: flat values to start from, 0 if None.
+        @param stopping_rule: one of `solvers.STOPPING_RULES`
 
         @return dict[State : float] with optimal policy
         """
-        previous_values = {state: 0 for state in self.maze.states.flatten()}
+        if initial_values is None:
+            previous_values = {
+                state: 0 for state in self.maze.states.flatten()
+            }
+        else:
+            previous_values = dict(zip(
+                self.maze.states.flatten(), 
+                initial_values.tolist()
+            ))
         delta = float("inf")
+        stop = float("inf")
         iteration = 0
         
-        while delta >= threshold:
+        while stop >= threshold:
             delta = 0
             new_values = previous_values.copy()
             for state in self.maze.states.flatten():
@@ -123,6 +394,18 @@ class OptimalPolicy(BasePolicy):
                 )
 
             iteration += 1 
+            stop = delta
+            if stopping_rule != "max_change":
+                # the values of both sweeps are in the same state order
+                values = np.fromiter(new_values.values(), float)
+                difference = values - \
+                    np.fromiter(previous_values.values(), float)
+                stop = stopping_value(
+                    difference[~self.maze.terminals.ravel()],
+                    values,
+                    discount,
+                    stopping_rule
+                )
             previous_values = new_values
 
             if visualise:
@@ -131,8 +414,124 @@ class OptimalPolicy(BasePolicy):
                     f"with current delta of {delta}:"
                 )
                 print(self.values_in_maze_to_str(new_values))
+        self.error_bound = error_bound(delta, discount)
+        self.sweeps = iteration
         return previous_values
 
+    @check_annotated
+    def _solve(
+        self, 
+        threshold: Annotated[float, FloatRange(0.0, float("inf"))],
+        discount: Annotated[float, FloatRange(0.0, 1.0)],
+        probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
+        visualise: bool=False,
+        backend: str="numpy",
+        method: str="value_iteration",
+        evaluation_depth: int=None,
+        sweep_order: str | np.ndarray="distance",
+        initial_values: np.ndarray=None,
+        precision: str="float64",
+        stopping_rule: str="max_change",
+        directory: str=None,
+        memory_budget: int=MEMORY_BUDGET
+    )-> SolverResult:
+        """
+        Vectorized solver
+
+        Compile `self.maze` and perform the bellman equation on all
+        states at once, in order to calculate each state's value and
+        the optimal action.
+        @see solvers.py
+
+        @param threshold: float greater than 0.0 with threshold for
+        when to stop converging
+        @param discount: discount for future values/states
+        @param probability: probability for any given action to succeed
+        @param visualise: print value matrix after each iteration
+        if true
+        @param backend: "numpy", "sparse", "parallel", "stencil" or
+        "tiled" backend
+        @param method: one of `METHODS`
+        @param evaluation_depth: fixed-policy backups per improvement
+        for "modified_policy_iteration", adaptive if None
+        @param sweep_order: order of visiting states for "gauss_seidel"
+        @see solvers.sweep_order
+        @param initial_values: flat values to start from, 0 if None.
+        @param precision: one of `PRECISIONS`
+        @param stopping_rule: one of `solvers.STOPPING_RULES`
+        @param directory: directory for the value files of the "tiled"
+        backend.
+        @param memory_budget: number of bytes a tile of the "tiled"
+        backend may use.
+
+        @return SolverResult with optimal values and actions
+        """
+        callback = None
+        if visualise:
+            def callback(iteration: int, delta: float, values: np.ndarray):
+                print(
+                    f"Values for current iteration ({iteration}),",
+                    f"with current delta of {delta}:"
+                )
+                print(self.values_in_maze_to_str(
+                    dict(zip(self.maze.states.flatten(), values))
+                ))
+
+        if backend == "parallel":
+            return parallel_value_iteration(
+                self.maze,
+                threshold,
+                discount,
+                probability,
+                None,
+                initial_values
+            )
+        if backend == "tiled":
+            return tiled_value_iteration(
+                type(self.maze),
+                self.maze.rewards,
+                self.maze.terminals,
+                directory,
+                threshold,
+                discount,
+                probability,
+                memory_budget
+            )
+        dtype = np.float32 if precision == "float32" else np.float64
+        if backend == "stencil":
+            model = self.maze.compile_stencil(probability, dtype)
+        else:
+            model = self.maze.compile(probability, backend == "sparse", dtype)
+        if precision == "mixed":
+            return mixed_precision_value_iteration(
+                model,
+                threshold,
+                discount,
+                callback,
+                initial_values,
+                stopping_rule
+            )
+        if backend == "stencil":
+            return value_iteration(
+                model,
+                threshold,
+                discount,
+                callback,
+                initial_values,
+                stopping_rule
+            )
+        return solve(
+            model,
+            threshold,
+            discount,
+            method,
+            evaluation_depth,
+            sweep_order,
+            callback,
+            initial_values,
+            stopping_rule
+        )
+
     @check_annotated
     def _determine_optimal_policy(
         self, 
@@ -204,7 +603,7 @@ class OptimalPolicy(BasePolicy):
         """
         # base case for the horizontal lines
         deviding_line = \
-            f"{('─' * 25 + '┼') * (self.maze.states.shape[0] - 1)}"\
+            f"{('─' * 25 + '┼') * (self.maze.grid_shape[0] - 1)}"\
             f"{'─' * 25}"
 
         output = f"┌{deviding_line.replace('┼', '┬')}┐\n│ "
@@ -236,5 +635,270 @@ class OptimalPolicy(BasePolicy):
 
         @return Action with Action to perform.
         """
-        return self.actions[state]
-    
\ No newline at end of file
+        if self.result is None:
+            return self.actions[state]
+
+        index = self.result.actions[
+            state.position[0] * self.maze.grid_shape[1] + \
+            state.position[1]
+        ]
+        return None if index < 0 else ACTIONS[index]
+
+    def update(self)-> SolverResult:
+        """
+        Re-solve after changes to `self.maze`.
+
+        Instead of solving the maze again, only the values around the
+        cells changed by `set_rewards` and `set_terminal` since this
+        policy was solved are updated, using prioritized sweeping from
+        the current values, in the floating point type of
+        `self.precision`. This is much cheaper for local changes in big
+        mazes. The updated values are at most `error_bound` of the
+        result away from the optimal values. A full re-solve has its
+        own error bound, so the two can differ by more than
+        `self.threshold`.
+        @see solvers.prioritized_sweeping
+
+        Starting from the changed cells only works if every other state
+        already has a residual below `self.threshold` in the compiled
+        maze. This is not the case for the "python" backend, which
+        solves a slightly different model for a `StupidMaze` with a
+        probability below 1.0, nor for stopping rules other than
+        "max_change", which can stop with larger residuals. These are
+        updated from the residuals of all states instead, which costs
+        one extra backup of every state.
+
+        After an update, the solution is always stored in `result`.
+
+        @return SolverResult with the statistics of the update
+        """
+        changed = None
+        if self.backend != "python" and self.stopping_rule == "max_change":
+            changed = self.maze.changed_since(self.maze_version)
+        result = prioritized_sweeping(
+            self.maze.compile(
+                self.probability,
+                False,
+                np.float32 if self.precision == "float32" else np.float64
+            ),
+            self.threshold,
+            self.discount,
+            self.value_table(),
+            changed
+        )
+        self.maze_version = self.maze.version
+
+        self.actions = None
+        self.values = None
+        self.result = result
+        self.error_bound = result.error_bound
+        return result
+
+    def estimate_sweeps_saved(
+        self, 
+        initial_values: np.ndarray,
+        threshold: float,
+        discount: float,
+        probability: float=1.0,
+        warm_sweeps: int=None,
+        stopping_rule: str="max_change"
+    )-> int:
+        """
+        Estimate how many sweeps a warm start saves.
+
+        Every sweep shrinks the largest bellman residual by at least a
+        factor `discount`, and value iteration stops once it drops below
+        `threshold`. Starting with a residual r therefore takes about
+        log(r / threshold) / log(1 / discount) sweeps. From 0 the
+        residual shrinks by close to that factor, so this predicts the
+        sweeps of a cold start well, and the sweeps saved are the
+        predicted cold sweeps minus the measured `warm_sweeps`.
+        After local changes, the residuals of a warm start shrink much
+        faster, so without `warm_sweeps` the prediction for the warm
+        start is an upper bound, and the estimate a lower bound.
+        The estimate is negative if the warm start is worse than starting
+        from 0.
+
+        The "bounded" stopping rule stops once the error bound
+        delta * discount / (1 - discount) drops below `threshold`, which
+        is the same as a largest residual below threshold * (1 -
+        discount) / discount. The "span" and "relative" rules do not stop
+        on a known residual, so there is no estimate for them.
+        @see solvers.stopping_value
+
+        @param initial_values: flat values the warm start started from.
+        @param threshold: threshold for when to stop converging
+        @param discount: discount for future values/states
+        @param probability: probability for any given action to succeed
+        @param warm_sweeps: sweeps value iteration took from
+        `initial_values`, or None if unknown.
+        @param stopping_rule: one of `solvers.STOPPING_RULES`
+
+        @return int with estimated number of saved sweeps, None
+        if the discount is 1.0 or 0.0, or for the "span" and "relative"
+        stopping rules
+        """
+        if discount >= 1.0 or discount <= 0.0 or \
+                stopping_rule in ("span", "relative"):
+            return None
+        if stopping_rule == "bounded":
+            threshold = threshold * (1.0 - discount) / discount
+
+        model = self.maze.compile(probability)
+        floor = max(threshold, np.finfo(float).tiny)
+        cold_residual = np.max(
+            np.abs(model.backup(np.zeros(model.n_states), discount)),
+            initial=0.0
+        )
+        cold_sweeps = (
+            np.log(max(cold_residual, floor)) - np.log(floor)
+        ) / np.log(1.0 / discount)
+        if warm_sweeps is None:
+            warm_residual = np.max(
+                np.abs(
+                    model.backup(initial_values, discount) - initial_values
+                ),
+                initial=0.0
+            )
+            warm_sweeps = (
+                np.log(max(warm_residual, floor)) - np.log(floor)
+            ) / np.log(1.0 / discount)
+        return int(round(cold_sweeps - warm_sweeps))
+
+    def value_table(self)-> np.ndarray:
+        """
+        Flat optimal value of every state of `self.maze`.
+
+        @return np.ndarray with (N,) values, indexed like a compiled maze
+        """
+        if self.result is not None:
+            return self.result.values
+        # the values are stored in the flat order of the states
+        return np.array(list(self.values.values()), dtype=float)
+
+    def action_table(self, maze: BaseMaze)-> np.ndarray:
+        """
+        Action index for every state of `maze`.
+        @see basePolicy.py
+
+        @param maze: BaseMaze object to create table for.
+
+        @return np.ndarray with (N,) action indices, -1 for no action
+        """
+        if self.result is not None:
+            return self.result.actions
+
+        table = np.full(maze.rewards.size, -1)
+        for index, state in enumerate(maze.states.flatten()):
+            if self.actions[state] is not None:
+                table[index] = ACTION_INDICES[self.actions[state]]
+        return table
+
+    def save(self, directory: str)-> None:
+        """
+        Save the solved policy to `directory`.
+
+        The values, action indices, rewards and terminals are saved as
+        raw .npy files, such that they can be memory-mapped by `load`.
+        The solver parameters and statistics go into policy.json.
+
+        @param directory: directory to save into, created if needed.
+        """
+        if type(self.maze).__name__ not in MAZE_CLASSES:
+            raise ValueError(
+                f"Can not save policies for {type(self.maze).__name__},"
+                f" expected one of {tuple(MAZE_CLASSES)}."
+            )
+
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (
+            ("values", self.value_table()),
+            ("actions", self.action_table(self.maze)),
+            ("rewards", self.maze.rewards),
+            ("terminals", self.maze.terminals)
+        ):
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+
+        metadata = {
+            "format_version": FORMAT_VERSION,
+            "maze": type(self.maze).__name__,
+            "threshold": self.threshold,
+            "discount": self.discount,
+            "probability": self.probability,
+            "backend": self.backend,
+            "method": self.method,
+            "precision": self.precision,
+            "stopping_rule": self.stopping_rule
+        }
+        if self.result is not None:
+            metadata.update(
+                sweeps=self.result.sweeps,
+                backups=self.result.backups,
+                delta=self.result.delta,
+                wall_time=self.result.wall_time,
+                error_bound=self.result.error_bound
+            )
+        with open(os.path.join(directory, "policy.json"), "w") as file:
+            json.dump(metadata, file, indent=4)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool=True)-> "OptimalPolicy":
+        """
+        Load a policy saved by `save`, without solving it again.
+
+        With `mmap`, the arrays are memory-mapped copy-on-write: pages
+        are only read from disk when used, and are shared between all
+        processes that load the same policy. Changes to the maze stay
+        in memory, and never end up in the saved files.
+
+        @param directory: directory the policy was saved to.
+        @param mmap: memory-map the arrays if True, read them if False.
+
+        @return OptimalPolicy with the loaded maze and solution
+        """
+        with open(os.path.join(directory, "policy.json")) as file:
+            metadata = json.load(file)
+        if metadata.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported policy format version"
+                f" {metadata.get('format_version')}, expected"
+                f" {FORMAT_VERSION}."
+            )
+
+        arrays = {
+            name: np.load(
+                os.path.join(directory, f"{name}.npy"),
+                mmap_mode="c" if mmap else None
+            )
+            for name in ("values", "actions", "rewards", "terminals")
+        }
+
+        policy = cls.__new__(cls)
+        BasePolicy.__init__(policy)
+        policy.maze = MAZE_CLASSES[metadata["maze"]].from_arrays(
+            arrays["rewards"],
+            arrays["terminals"]
+        )
+        policy.threshold = metadata["threshold"]
+        policy.discount = metadata["discount"]
+        policy.probability = metadata["probability"]
+        policy.backend = metadata["backend"]
+        policy.method = metadata["method"]
+        policy.precision = metadata["precision"]
+        policy.stopping_rule = metadata["stopping_rule"]
+        policy.maze_version = policy.maze.version
+        policy.actions = None
+        policy.values = None
+        policy.sweeps = None
+        policy.estimated_sweeps_saved = None
+        policy.result = SolverResult(
+            arrays["values"],
+            arrays["actions"],
+            metadata.get("sweeps"),
+            metadata.get("backups"),
+            metadata.get("delta"),
+            metadata.get("wall_time"),
+            metadata.get("error_bound")
+        )
+        policy.error_bound = policy.result.error_bound
+        return policy
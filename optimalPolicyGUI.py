@@ -1,11 +1,11 @@
 import numpy as np
-import pygame
 from typing import Annotated
 
 from action import Action
 from optimalPolicy import OptimalPolicy
 from floatRange import FloatRange, check_annotated
 from baseMaze import BaseMaze
+from solvers import error_bound, stopping_value
 from state import State
 from utils import draw_matrix, put_agent_colour_in_colour_matrix, BLACK, WINDOW_SIZE
         
@@ -28,12 +28,13 @@ class OptimalPolicyGUI(OptimalPolicy):
         probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0
     )-> None:
         """
-        @var $maze
-        **Maze** with MDP information
+        The maze is solved by `OptimalPolicy` with the "python" backend,
+        using the value iteration and policy extraction with GUI below,
+        so all other attributes are those of `OptimalPolicy`.
+        @see optimalPolicy.py
 
-        @var $actions
-        **dict[state : action]** 
-        dictionary with states mapping to optimal actions.  
+        @var $colour_matrix
+        **np.ndarray** colours of the cells in the GUI.
 
         @var $font
         **pygame.font**
@@ -44,6 +45,8 @@ class OptimalPolicyGUI(OptimalPolicy):
         pygame display for GUI
         
         """
+        import pygame
+
         pygame.init()
         self.font = pygame.font.SysFont(None, 20)
         self.screen = pygame.display.set_mode(WINDOW_SIZE)
@@ -51,17 +54,7 @@ class OptimalPolicyGUI(OptimalPolicy):
             "Calculating Optimal Policy, Iteration = 0, Delta = 0"
         )
         self.colour_matrix = colour_matrix
-        self.maze = maze
-        self.actions = self._determine_optimal_policy(
-            self._value_iteration(
-                threshold, 
-                discount,
-                probability, 
-                False
-            ), 
-            discount,
-            probability
-        )
+        super().__init__(maze, threshold, discount, probability)
 
     @check_annotated
     def _value_iteration(
@@ -69,13 +62,17 @@ class OptimalPolicyGUI(OptimalPolicy):
         threshold: Annotated[float, FloatRange(0.0, float("inf"))],
         discount: Annotated[float, FloatRange(0.0, 1.0)],
         probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
-        visualise: bool=False
+        visualise: bool=False,
+        initial_values: np.ndarray=None,
+        stopping_rule: str="max_change"
     )-> dict[State : float]:
         """
         Value iteration with GUI
 
         Perform bellman equation on MDP, given provided parameters,
         in order to calculate each state's value.
+        Sets `self.error_bound` of the calculated values, and the
+        number of `self.sweeps` it took.
         
         @param threshold: float greater than 0.0 with threshold for
         when to stop converging
@@ -83,16 +80,32 @@ class OptimalPolicyGUI(OptimalPolicy):
         @param probability: probability for any given action to succeed
         @param visualise: print value matrix after each iteration
         if true
+        @param initial_values: flat values to start from, 0 if None.
+        @param stopping_rule: one of `solvers.STOPPING_RULES`
 
         @return dict[State : float] with optimal policy
         """
-        previous_values = {state: 0 for state in self.maze.states.flatten()}
+        import pygame
+
+        if initial_values is None:
+            previous_values = {
+                state: 0 for state in self.maze.states.flatten()
+            }
+        else:
+            previous_values = dict(zip(
+                self.maze.states.flatten(), 
+                initial_values.tolist()
+            ))
         delta = float("inf")
+        stop = float("inf")
         iteration = 0
         
 
         data_matrix = np.array([
-            [f"r = {state.reward} | v = 0" for state in row]
+            [
+                f"r = {state.reward} | v = {previous_values[state]}"
+                for state in row
+            ]
             for row in self.maze.states
         ]).T[::-1]
         draw_matrix(data_matrix, self.colour_matrix, self.screen, self.font)
@@ -103,7 +116,7 @@ class OptimalPolicyGUI(OptimalPolicy):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-            if delta >= threshold:
+            if stop >= threshold:
                 delta = 0
                 new_values = previous_values.copy()
                 for state in self.maze.states.flatten():
@@ -149,6 +162,18 @@ class OptimalPolicyGUI(OptimalPolicy):
                     ])
 
                 iteration += 1 
+                stop = delta
+                if stopping_rule != "max_change":
+                    # the values of both sweeps are in the same state order
+                    values = np.fromiter(new_values.values(), float)
+                    difference = values - \
+                        np.fromiter(previous_values.values(), float)
+                    stop = stopping_value(
+                        difference[~self.maze.terminals.ravel()],
+                        values,
+                        discount,
+                        stopping_rule
+                    )
                 previous_values = new_values
 
                 pygame.display.set_caption(
@@ -165,6 +190,8 @@ class OptimalPolicyGUI(OptimalPolicy):
                 draw_matrix(data_matrix, self.colour_matrix, self.screen, self.font)
 
         pygame.quit()
+        self.error_bound = error_bound(delta, discount)
+        self.sweeps = iteration
         return previous_values
 
     @check_annotated
@@ -187,6 +214,8 @@ class OptimalPolicyGUI(OptimalPolicy):
 
         #return dict[State : Action] with optimal policy for each State.
         """
+        import pygame
+
         actions = {state: None for state in self.maze.states.flatten()}
 
         for state in self.maze.states.flatten():
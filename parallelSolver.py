@@ -0,0 +1,237 @@
+import multiprocessing
+import multiprocessing.synchronize
+import os
+import time
+
+import numpy as np
+
+from baseMaze import BaseMaze
+from mazeModel import MazeModel
+from sharedArrays import attach_array, share_array
+from solvers import SolverResult, error_bound, precision_floor
+
+
+def _row_blocks(
+    width: int,
+    n_workers: int
+)-> list[tuple[int, int, int, int]]:
+    """
+    Split the rows of a maze into equally sized blocks.
+
+    @param width: number of rows of the maze.
+    @param n_workers: number of blocks.
+
+    @return list[tuple[int, int, int, int]] with start and stop of the
+    rows of every block, and the start and stop including the halo rows
+    """
+    bounds = np.linspace(0, width, n_workers + 1).round().astype(int)
+    return [
+        (start, stop, max(start - 1, 0), min(stop + 1, width))
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist())
+    ]
+
+
+def _sweep_block(
+    descriptions: dict[str, dict],
+    maze_class: type[BaseMaze],
+    rewards: np.ndarray,
+    terminals: np.ndarray,
+    block: tuple[int, int, int, int],
+    worker: int,
+    threshold: float,
+    discount: float,
+    probability: float,
+    barrier: multiprocessing.synchronize.Barrier
+)-> None:
+    """
+    Perform value iteration on a single row block, in a worker process.
+
+    Every sweep reads the values of the block and its halo rows from
+    one shared buffer, and writes the new values of the block to the
+    other. After the barrier, every worker sees the deltas and largest
+    values of all blocks, so all workers agree on when to stop, like
+    `solvers.value_iteration`: once the delta drops below `threshold`,
+    or below the rounding noise of the values. The deltas and largest
+    values are double buffered as well, such that a fast worker can not
+    overwrite them before a slow worker has read them.
+    @see solvers.precision_floor
+
+    @param descriptions: description of every shared array, by name.
+    @param maze_class: maze class, deciding the boundary rules.
+    @param rewards: reward rows of the block, including halo rows.
+    @param terminals: terminal rows of the block, including halo rows.
+    @param block: rows of the block, as created by `_row_blocks`.
+    @param worker: index of the worker.
+    @param threshold: threshold for when to stop converging
+    @param discount: discount for future values/states
+    @param probability: probability for any given action to succeed
+    @param barrier: barrier shared by all workers.
+    """
+    try:
+        arrays = {
+            name: attach_array(description)
+            for name, description in descriptions.items()
+        }
+        values = arrays["values"][1]
+        deltas = arrays["deltas"][1]
+        scales = arrays["scales"][1]
+        start, stop, low, high = block
+        height = values.shape[2]
+        model = MazeModel(
+            (high - low, height),
+            maze_class.successor_table((high - low, height)),
+            rewards.astype(float).ravel(),
+            terminals.ravel(),
+            probability
+        )
+        # only the inner rows belong to this block
+        inner = slice((start - low) * height, (stop - low) * height)
+
+        parity = 0
+        sweeps = 0
+        while True:
+            block_values = values[parity, low:high].ravel()
+            new_values = model.backup(block_values, discount)[inner]
+            deltas[parity, worker] = np.max(
+                np.abs(new_values - block_values[inner]),
+                initial=0.0
+            )
+            scales[parity, worker] = np.max(np.abs(new_values), initial=0.0)
+            values[1 - parity, start:stop] = new_values.reshape(
+                stop - start,
+                height
+            )
+            barrier.wait()
+
+            delta = deltas[parity].max()
+            # the floor of the largest values of all blocks is the floor
+            # of all values
+            floor = precision_floor(scales[parity])
+            parity = 1 - parity
+            sweeps += 1
+            if delta < threshold or delta <= floor:
+                break
+
+        _, actions = model.greedy(values[parity, low:high].ravel(), discount)
+        arrays["actions"][1][start:stop] = actions[inner].reshape(
+            stop - start,
+            height
+        )
+        if worker == 0:
+            arrays["statistics"][1][:] = (sweeps, delta, parity)
+    except BaseException:
+        # let the other workers fail instead of waiting forever
+        barrier.abort()
+        raise
+
+
+def parallel_value_iteration(
+    maze: BaseMaze,
+    threshold: float,
+    discount: float,
+    probability: float=1.0,
+    n_workers: int=None,
+    initial_values: np.ndarray=None
+)-> SolverResult:
+    """
+    Value iteration, with the sweeps spread over multiple processes.
+
+    The maze is split into blocks of rows, one for every worker
+    process. The workers keep the compiled model of their own block,
+    and exchange values through two buffers in shared memory, with a
+    barrier after every sweep. This gives the exact same result as
+    `solvers.value_iteration`.
+
+    @param maze: maze to solve.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param probability: probability for any given action to succeed
+    @param n_workers: number of worker processes, number of CPUs
+    if None.
+    @param initial_values: (N,) values to start from, 0 if None.
+
+    @return SolverResult with optimal values and actions
+    """
+    start_time = time.perf_counter()
+    width, height = maze.grid_shape
+    n_workers = min(n_workers or os.cpu_count() or 1, width)
+    blocks = _row_blocks(width, n_workers)
+
+    # the start values, like `solvers.start_values`, without compiling
+    # the whole maze in this process
+    values = np.zeros((2, width, height))
+    if initial_values is not None:
+        initial_values = np.asarray(initial_values).ravel()
+        if initial_values.size != width * height:
+            raise ValueError(
+                f"Expected {width * height} initial values,"
+                f" got {initial_values.size}."
+            )
+        values[0] = initial_values.reshape(width, height)
+        values[0][maze.terminals] = 0.0
+
+    shared_blocks = []
+    descriptions = {}
+    arrays = {}
+    try:
+        for name, array in (
+            ("values", values),
+            ("deltas", np.zeros((2, n_workers))),
+            ("scales", np.zeros((2, n_workers))),
+            ("actions", np.zeros((width, height), dtype=np.int8)),
+            ("statistics", np.zeros(3))
+        ):
+            shared_block, descriptions[name] = share_array(array)
+            shared_blocks.append(shared_block)
+            arrays[name] = np.ndarray(
+                array.shape,
+                array.dtype,
+                shared_block.buf
+            )
+        del values
+
+        barrier = multiprocessing.Barrier(n_workers)
+        workers = [
+            multiprocessing.Process(
+                target=_sweep_block,
+                args=(
+                    descriptions,
+                    type(maze),
+                    maze.rewards[low:high],
+                    maze.terminals[low:high],
+                    (start, stop, low, high),
+                    worker,
+                    threshold,
+                    discount,
+                    probability,
+                    barrier
+                )
+            )
+            for worker, (start, stop, low, high) in enumerate(blocks)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if any(worker.exitcode != 0 for worker in workers):
+            raise RuntimeError("A worker of the parallel sweep failed.")
+
+        sweeps, delta, parity = arrays["statistics"].tolist()
+        values = arrays["values"][int(parity)].ravel().copy()
+        actions = arrays["actions"].ravel().astype(int)
+    finally:
+        arrays.clear()
+        for shared_block in shared_blocks:
+            shared_block.close()
+            shared_block.unlink()
+
+    return SolverResult(
+        values,
+        actions,
+        int(sweeps),
+        int(sweeps) * maze.rewards.size,
+        delta,
+        time.perf_counter() - start_time,
+        error_bound(delta, discount)
+    )
@@ -0,0 +1,217 @@
+import itertools
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+
+from baseMaze import BaseMaze
+from mazeModel import MazeModel
+from sharedArrays import attach_array, share_array
+from solvers import METHODS, solve
+from sparseMazeModel import SparseMazeModel
+
+
+@dataclass
+class SweepResult:
+    """
+    SweepResult class
+
+    This class holds the solutions of a parameter sweep.
+    Entry [d, p, t] belongs to discounts[d], probabilities[p] and
+    thresholds[t]. Values and actions have an extra last axis, indexed
+    like the model states.
+    @see mazeModel.py
+    """
+    discounts: np.ndarray
+    probabilities: np.ndarray
+    thresholds: np.ndarray
+    values: np.ndarray
+    actions: np.ndarray
+    sweeps: np.ndarray
+    wall_time: np.ndarray
+
+
+# Shared arrays and compiled models of a worker process,
+# set up once per process by `_initialise_worker`.
+_worker_arrays = {}
+_worker_models = {}
+
+
+def _initialise_worker(descriptions: dict[str, dict])-> None:
+    """
+    Attach a worker process to all shared arrays.
+
+    @param descriptions: description of every shared array, by name.
+    """
+    _worker_arrays.clear()
+    _worker_models.clear()
+    for name, description in descriptions.items():
+        _worker_arrays[name] = attach_array(description)
+
+
+def _solve_configuration(
+    index: int,
+    discount: float,
+    probability: float,
+    threshold: float,
+    method: str,
+    sparse: bool
+)-> tuple[int, int, float]:
+    """
+    Solve a single configuration inside of a worker process.
+
+    The model for every probability is only compiled once per worker,
+    from the shared layout. The solution is written straight into the
+    shared output arrays, so only the statistics are sent back.
+
+    @param index: flat index of the configuration in the output.
+    @param discount: discount for future values/states
+    @param probability: probability for any given action to succeed
+    @param threshold: threshold for when to stop converging
+    @param method: one of `METHODS`
+    @param sparse: use a `SparseMazeModel`, if True.
+
+    @return tuple[int, int, float] with index, sweeps and wall time
+    """
+    model = _worker_models.get(probability)
+    if model is None:
+        model_class = SparseMazeModel if sparse else MazeModel
+        model = model_class(
+            tuple(_worker_arrays["grid_shape"][1]),
+            _worker_arrays["successors"][1],
+            _worker_arrays["rewards"][1],
+            _worker_arrays["terminal"][1],
+            probability
+        )
+        _worker_models[probability] = model
+
+    result = solve(model, threshold, discount, method)
+    _worker_arrays["values"][1][index] = result.values
+    _worker_arrays["actions"][1][index] = result.actions
+    return index, result.sweeps, result.wall_time
+
+
+def parameter_sweep(
+    maze: BaseMaze,
+    discounts: list[float],
+    probabilities: list[float],
+    thresholds: list[float],
+    method: str="value_iteration",
+    sparse: bool=False,
+    max_workers: int=None
+)-> SweepResult:
+    """
+    Solve `maze` for every combination of the given parameters.
+
+    The maze layout is compiled once, and shared with a pool of worker
+    processes through shared memory, together with the output arrays.
+    Every worker then only compiles the slip model for the
+    probabilities it gets, and solves the configurations in parallel.
+
+    @param maze: maze to solve.
+    @param discounts: discounts for future values/states
+    @param probabilities: probabilities for any given action to succeed
+    @param thresholds: thresholds for when to stop converging
+    @param method: one of `METHODS`
+    @param sparse: solve with sparse transition matrices, if True.
+    @param max_workers: number of worker processes, number of CPUs
+    if None.
+
+    @return SweepResult with values and actions of every configuration
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Unknown method {method!r}. Expected one of {METHODS}."
+        )
+    discounts = np.asarray(discounts, dtype=float)
+    probabilities = np.asarray(probabilities, dtype=float)
+    thresholds = np.asarray(thresholds, dtype=float)
+    for name, parameters, maximum in (
+        ("discounts", discounts, 1.0),
+        ("probabilities", probabilities, 1.0),
+        ("thresholds", thresholds, float("inf"))
+    ):
+        if np.any((parameters < 0.0) | (parameters > maximum)):
+            raise ValueError(
+                f"All {name} must be in range [0.0, {maximum}]."
+            )
+
+    model = maze.compile()
+    shape = (len(discounts), len(probabilities), len(thresholds))
+    n_configurations = int(np.prod(shape))
+
+    blocks = []
+    descriptions = {}
+    arrays = {}
+    try:
+        for name, array in (
+            ("grid_shape", np.array(model.grid_shape)),
+            ("successors", model.successors),
+            ("rewards", model.rewards),
+            ("terminal", model.terminal),
+            ("values", np.zeros((n_configurations, model.n_states))),
+            ("actions", np.zeros((n_configurations, model.n_states), int))
+        ):
+            block, descriptions[name] = share_array(array)
+            blocks.append(block)
+            arrays[name] = np.ndarray(
+                array.shape,
+                array.dtype,
+                block.buf,
+                order=descriptions[name]["order"]
+            )
+
+        # configurations with the same probability next to each other,
+        # such that workers can reuse their compiled models
+        configurations = [
+            (
+                np.ravel_multi_index((d, p, t), shape),
+                discounts[d],
+                probabilities[p],
+                thresholds[t]
+            )
+            for p, d, t in itertools.product(
+                range(shape[1]), range(shape[0]), range(shape[2])
+            )
+        ]
+
+        sweeps = np.zeros(n_configurations, dtype=int)
+        wall_time = np.zeros(n_configurations)
+        with ProcessPoolExecutor(
+            max_workers,
+            initializer=_initialise_worker,
+            initargs=(descriptions,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _solve_configuration,
+                    index,
+                    discount,
+                    probability,
+                    threshold,
+                    method,
+                    sparse
+                )
+                for index, discount, probability, threshold \
+                    in configurations
+            ]
+            for future in futures:
+                index, sweeps[index], wall_time[index] = future.result()
+
+        values = arrays["values"].reshape(*shape, model.n_states).copy()
+        actions = arrays["actions"].reshape(*shape, model.n_states).copy()
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return SweepResult(
+        discounts,
+        probabilities,
+        thresholds,
+        values,
+        actions,
+        sweeps.reshape(shape),
+        wall_time.reshape(shape)
+    )
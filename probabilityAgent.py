@@ -62,7 +62,7 @@ class ProbabilityAgent(BaseAgent):
             desired_action = None
             try:
                 action = self.policy.select_action(
-                    self.maze[self.current_coordinate]
+                    self.maze.state_at(self.current_coordinate)
                 )
                 desired_action = action
                 # no actions to be taken if terminal state is reached
@@ -74,7 +74,9 @@ class ProbabilityAgent(BaseAgent):
                 if dice_roll > self.probability:
                     new_choices = list(
                             self.maze.get_destinations(
-                                self.maze[self.current_coordinate]
+                                self.maze.state_at(
+                                    self.current_coordinate
+                                )
                             ).keys()
                         )
                     new_choices.remove(action)
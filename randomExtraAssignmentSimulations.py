@@ -1,5 +1,4 @@
 import numpy as np
-import pygame
 
 from basePolicy import BasePolicy
 from optimalPolicy import OptimalPolicy
@@ -50,7 +49,7 @@ def simulate_probability_5x10_grid_w_random_reward(
 
     if let_agent_play:
         # keep going until terminate state is reached
-        while not maze[agent.current_coordinate].is_terminal:
+        while not maze.state_at(agent.current_coordinate).is_terminal:
             agent.act(True)
 
 def simulate_probability_2x2_grid_w_random_reward_GUI(
@@ -63,6 +62,8 @@ def simulate_probability_2x2_grid_w_random_reward_GUI(
 
     @param let_agent_play: let agent perform actions if true, else not
     """
+    import pygame
+
     maze_shape = (2,2)
     probability = 0.8
 
@@ -116,7 +117,7 @@ def simulate_probability_2x2_grid_w_random_reward_GUI(
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-            if not maze[agent.current_coordinate].is_terminal:
+            if not maze.state_at(agent.current_coordinate).is_terminal:
                 agent.act()
             draw_matrix(
                 data_matrix, 
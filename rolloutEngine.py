@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+import numpy as np
+
+from action import ACTIONS
+from baseMaze import BaseMaze
+from basePolicy import BasePolicy
+from floatRange import FloatRange, check_annotated
+
+
+# Without a `max_steps`, discounted episodes stop once the weight of
+# the next reward drops below this tolerance.
+HORIZON_TOLERANCE = 1e-8
+# Without a `max_steps` and without discount, episodes stop after this
+# many steps per state of the maze.
+UNDISCOUNTED_STEPS_PER_STATE = 10
+
+
+@dataclass
+class RolloutResult:
+    """
+    RolloutResult class
+
+    This class holds the outcome of a batch of episodes.
+    Every entry belongs to one episode.
+    """
+    returns: np.ndarray
+    lengths: np.ndarray
+    terminated: np.ndarray
+
+
+class RolloutEngine:
+    """
+    RolloutEngine class.
+
+    This engine simulates many `ProbabilityAgent`s at once, which all
+    follow the same `Policy` in the same maze.
+    @see probabilityAgent.py
+
+    The positions of all agents are kept in a single array, and every
+    step advances all agents that have not reached a terminal state.
+    Slipping is sampled for all agents at once: the desired action
+    succeeds with `probability`, any of the other valid actions is
+    performed with an equal share of the left-over probability.
+    """
+
+    @check_annotated
+    def __init__(
+        self, 
+        maze: BaseMaze, 
+        policy: BasePolicy, 
+        probability: Annotated[float, FloatRange(0.0, 1.0)]=1.0,
+        discount: Annotated[float, FloatRange(0.0, 1.0)]=1.0
+    )-> None:
+        """
+        @var $maze
+        **Maze** `BaseMaze` in which the agents are present.
+        @var $policy 
+        **Policy** `Policy` which the agents use to act
+        @var $probability 
+        **float** Chance for agents to perform desired action.
+        @var $discount
+        **float** Discount for future rewards in the returns.
+        @var $model
+        **MazeModel** Compiled `maze`.
+        @var $actions
+        **np.ndarray** (N,) action index of `policy` for every state,
+        None for a random policy.
+        """
+        self.maze = maze
+        self.policy = policy
+        self.probability = probability
+        self.discount = discount
+        self.model = maze.compile(probability)
+        self.actions = policy.action_table(maze)
+
+    def _random_actions(
+        self, 
+        rng: np.random.Generator, 
+        allowed: np.ndarray
+    )-> np.ndarray:
+        """
+        Pick a uniformly random allowed action for every agent.
+
+        @param rng: random number generator to use.
+        @param allowed: (K, 4) boolean mask of allowed actions.
+
+        @return np.ndarray with (K,) action indices
+        """
+        keys = rng.random(allowed.shape)
+        keys[~allowed] = -1.0
+        return np.argmax(keys, axis=1)
+
+    def horizon(self)-> int:
+        """
+        Default maximum length of an episode.
+
+        A policy does not have to reach a terminal state, e.g. an optimal
+        policy with discount that keeps collecting positive rewards, so
+        episodes always need a limit. With discount, episodes stop once
+        discount^steps drops below `HORIZON_TOLERANCE`, which cuts off
+        at most that fraction of the return of an endless episode.
+        Without discount, they stop after `UNDISCOUNTED_STEPS_PER_STATE`
+        steps per state.
+
+        @return int with maximum number of steps
+        """
+        if self.discount < 1.0:
+            if self.discount <= 0.0:
+                return 1
+            return max(1, int(np.ceil(
+                np.log(HORIZON_TOLERANCE) / np.log(self.discount)
+            )))
+        return UNDISCOUNTED_STEPS_PER_STATE * self.model.n_states
+
+    def run(
+        self, 
+        start_coordinate: tuple[int, int], 
+        n_episodes: int, 
+        max_steps: int=None,
+        seed: int | np.random.Generator=None
+    )-> RolloutResult:
+        """
+        Run a batch of episodes.
+
+        Every episode starts on `start_coordinate`, and runs until
+        a terminal state is reached, or `max_steps` steps are taken.
+        Episodes that were cut off are reported as not terminated.
+        The return of an episode is the discounted sum of the rewards
+        of all states it entered.
+
+        @param start_coordinate: x, y coordinate to start from.
+        @param n_episodes: number of episodes to run.
+        @param max_steps: maximum length of an episode, `horizon()` if
+        None.
+        @see horizon
+        @param seed: seed for the random number generator, or the
+        generator itself.
+
+        @return RolloutResult with return, length and termination of
+        every episode
+        """
+        rng = np.random.default_rng(seed)
+        model = self.model
+        if max_steps is None:
+            max_steps = self.horizon()
+        start = self.maze.flat_index(start_coordinate)
+
+        states = np.full(n_episodes, start)
+        returns = np.zeros(n_episodes)
+        lengths = np.zeros(n_episodes, dtype=int)
+        weights = np.ones(n_episodes)
+        active = np.arange(n_episodes)
+        if model.terminal[start]:
+            active = active[:0]
+
+        step = 0
+        while active.size > 0 and step < max_steps:
+            current = states[active]
+            if self.actions is None:
+                actions = self._random_actions(rng, model.valid[current])
+            else:
+                actions = self.actions[current]
+                # no actions to be taken if the policy has none
+                has_action = actions >= 0
+                active = active[has_action]
+                current = current[has_action]
+                actions = actions[has_action]
+
+            # take into account that a decision can fail
+            slipping = np.flatnonzero(
+                rng.random(active.size) > model.success[current]
+            )
+            if slipping.size > 0:
+                actions[slipping] = self._random_actions(
+                    rng,
+                    model.valid[current[slipping]] & (
+                        np.arange(len(ACTIONS)) != actions[slipping, None]
+                    )
+                )
+
+            destinations = model.successors[current, actions]
+            returns[active] += weights[active] * model.rewards[destinations]
+            weights[active] *= self.discount
+            lengths[active] += 1
+            states[active] = destinations
+
+            active = active[~model.terminal[destinations]]
+            step += 1
+
+        return RolloutResult(returns, lengths, model.terminal[states])
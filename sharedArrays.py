@@ -0,0 +1,51 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def share_array(
+    array: np.ndarray
+)-> tuple[shared_memory.SharedMemory, dict]:
+    """
+    Copy `array` into a new block of shared memory.
+
+    @param array: array to share.
+
+    @return tuple[shared_memory.SharedMemory, dict] with the block and
+    a picklable description to attach to it from another process
+    """
+    order = "F" if array.flags.f_contiguous and array.ndim > 1 else "C"
+    block = shared_memory.SharedMemory(
+        create=True, 
+        size=max(array.nbytes, 1)
+    )
+    np.ndarray(array.shape, array.dtype, block.buf, order=order)[...] = array
+    return block, {
+        "name": block.name,
+        "shape": array.shape,
+        "dtype": array.dtype.str,
+        "order": order
+    }
+
+
+def attach_array(
+    description: dict
+)-> tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Attach to a block of shared memory, created by `share_array`.
+
+    Worker processes share the resource tracker of the creating
+    process, which owns and unlinks the block.
+
+    @param description: description of the shared array.
+
+    @return tuple[shared_memory.SharedMemory, np.ndarray] with the block
+    and an array view on it
+    """
+    block = shared_memory.SharedMemory(description["name"])
+    return block, np.ndarray(
+        description["shape"],
+        description["dtype"],
+        block.buf,
+        order=description["order"]
+    )
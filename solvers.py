@@ -0,0 +1,890 @@
+import heapq
+import time
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from mazeModel import MazeModel
+
+
+# Upper limit for the adaptive evaluation depth of modified policy iteration.
+MAX_EVALUATION_DEPTH = 64
+METHODS = (
+    "value_iteration", 
+    "policy_iteration", 
+    "modified_policy_iteration",
+    "gauss_seidel",
+    "prioritized_sweeping"
+)
+STOPPING_RULES = ("max_change", "span", "bounded", "relative")
+
+
+@dataclass
+class SolverResult:
+    """
+    SolverResult class
+
+    This class holds the outcome of solving a `MazeModel`.
+    Values and actions are flat vectors, indexed like the model states.
+    A sweep is one pass over all states, a backup the update of the
+    value of a single state.
+    The error bound is the largest possible difference between the
+    values and the optimal values, inf if there is no discount and
+    None if it is unknown.
+    @see mazeModel.py
+    """
+    values: np.ndarray
+    actions: np.ndarray
+    sweeps: int
+    backups: int
+    delta: float
+    wall_time: float
+    error_bound: float=None
+
+
+def start_values(
+    model: MazeModel,
+    values: np.ndarray=None
+)-> np.ndarray:
+    """
+    Values to start solving from.
+
+    Solving starts from 0 for every state, unless a warm start is given,
+    e.g. the values of a previous solution of a similar maze.
+    Terminal states always start at 0.
+
+    @param model: compiled maze to solve.
+    @param values: (N,) vector with the values to start from, or None.
+
+    @return np.ndarray with new (N,) start values, in the floating
+    point type of `model`
+    """
+    if values is None:
+        return np.zeros(model.n_states, dtype=model.dtype)
+
+    values = np.array(values, dtype=model.dtype).ravel()
+    if values.shape != (model.n_states,):
+        raise ValueError(
+            f"Expected {model.n_states} initial values, got {values.size}."
+        )
+    values[model.terminal] = 0.0
+    return values
+
+
+def precision_floor(
+    values: np.ndarray,
+    axis: int=None
+)-> float | np.ndarray:
+    """
+    Smallest change in value that is not rounding noise.
+
+    Sweeps keep changing the values by a few units in the last place,
+    so a threshold below this floor can never be reached.
+
+    @param values: current values, in their own floating point type.
+    @param axis: axis of `values` with the states, all axes if None.
+
+    @return float, or np.ndarray along the other axes, with smallest
+    meaningful change of `values`
+    """
+    floor = 8 * float(np.finfo(values.dtype).eps) * \
+        np.max(np.abs(values), axis=axis, initial=1.0)
+    return float(floor) if axis is None else floor
+
+
+def error_bound(delta: float, discount: float)-> float:
+    """
+    Certified error of the values after a sweep.
+
+    The bellman backup is a contraction by `discount`, so values that
+    changed at most `delta` in the last sweep differ at most
+    delta * discount / (1 - discount) from the optimal values, and the
+    greedy policy of those values loses at most twice that.
+
+    @param delta: largest change in value of the last sweep.
+    @param discount: discount for future values/states
+
+    @return float with the error bound, inf if there is no discount
+    """
+    if discount >= 1.0:
+        return float("inf")
+    return delta * discount / (1.0 - discount)
+
+
+def check_stopping_rule(rule: str, discount: float)-> None:
+    """
+    Check whether `rule` can be used with `discount`.
+
+    @param rule: one of `STOPPING_RULES`
+    @param discount: discount for future values/states
+    """
+    if rule not in STOPPING_RULES:
+        raise ValueError(
+            f"Unknown stopping rule {rule!r}."
+            f" Expected one of {STOPPING_RULES}."
+        )
+    if rule == "bounded" and discount >= 1.0:
+        raise ValueError(
+            "The 'bounded' stopping rule requires a discount below 1.0."
+        )
+
+
+def stopping_value(
+    difference: np.ndarray,
+    values: np.ndarray,
+    discount: float,
+    rule: str="max_change"
+)-> float:
+    """
+    Value that is compared to the threshold, to decide when to stop.
+
+    Possible rules:
+    - "max_change": largest change in value of a state.
+    - "span": largest minus smallest change in value. Changes that are
+    the same for every state do not change the greedy policy, so this
+    stops earlier, and also works without discount. Terminal states
+    never change, so they have to be left out of `difference`.
+    - "bounded": the error bound of the values, such that `threshold`
+    is the required distance to the optimal values.
+    @see error_bound
+    - "relative": largest change in value, relative to the largest
+    value.
+
+    @param difference: change in value of every non-terminal state
+    in a sweep.
+    @param values: values after the sweep.
+    @param discount: discount for future values/states
+    @param rule: one of `STOPPING_RULES`
+
+    @return float with the value to compare to the threshold
+    """
+    if rule == "span":
+        if difference.size == 0:
+            return 0.0
+        return float(np.max(difference) - np.min(difference))
+    delta = float(np.max(np.abs(difference), initial=0.0))
+    if rule == "bounded":
+        return error_bound(delta, discount)
+    if rule == "relative":
+        return delta / max(
+            float(np.max(np.abs(values), initial=0.0)),
+            np.finfo(float).tiny
+        )
+    return delta
+
+
+def value_iteration(
+    model: MazeModel,
+    threshold: float,
+    discount: float,
+    callback: Callable[[int, float, np.ndarray], None]=None,
+    initial_values: np.ndarray=None,
+    stopping_rule: str="max_change"
+)-> SolverResult:
+    """
+    Vectorized value iteration.
+
+    Every sweep performs the bellman backup for all states at once,
+    on a flat value vector, in the floating point type of `model`.
+    Stops once the `stopping_rule` of a sweep drops below `threshold`,
+    or the largest change in value drops below the rounding noise of
+    that type.
+    @see stopping_value
+    @see precision_floor
+
+    @param model: compiled maze to solve.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param callback: called with the sweep number, delta and values
+    after every sweep, if given.
+    @param initial_values: (N,) values to start from, 0 if None.
+    @see start_values
+    @param stopping_rule: one of `STOPPING_RULES`
+
+    @return SolverResult with optimal values and actions
+    """
+    check_stopping_rule(stopping_rule, discount)
+    start_time = time.perf_counter()
+    values = start_values(model, initial_values)
+    delta = float("inf")
+    stop = float("inf")
+    sweeps = 0
+
+    while stop >= threshold and delta > precision_floor(values):
+        new_values = model.backup(values, discount)
+        difference = new_values - values
+        delta = float(np.max(np.abs(difference), initial=0.0))
+        if stopping_rule == "max_change":
+            stop = delta
+        else:
+            stop = stopping_value(
+                difference[~model.terminal],
+                new_values,
+                discount,
+                stopping_rule
+            )
+        values = new_values
+        sweeps += 1
+
+        if callback is not None:
+            callback(sweeps, delta, values)
+
+    _, actions = model.greedy(values, discount)
+    return SolverResult(
+        values,
+        actions,
+        sweeps,
+        sweeps * model.n_states,
+        delta,
+        time.perf_counter() - start_time,
+        error_bound(delta, discount)
+    )
+
+
+def mixed_precision_value_iteration(
+    model: MazeModel,
+    threshold: float,
+    discount: float,
+    callback: Callable[[int, float, np.ndarray], None]=None,
+    initial_values: np.ndarray=None,
+    stopping_rule: str="max_change"
+)-> SolverResult:
+    """
+    Mixed precision value iteration.
+
+    Most sweeps are done in float32, which halves the memory traffic,
+    until the values converge or only change by float32 rounding noise.
+    The values are then polished in float64, until the `stopping_rule`
+    of a sweep drops below `threshold`.
+    @see value_iteration
+
+    @param model: compiled maze to solve, of any floating point type.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param callback: called with the sweep number, delta and values
+    after every sweep of both phases, if given.
+    @param initial_values: (N,) values to start from, 0 if None.
+    @param stopping_rule: one of `STOPPING_RULES`
+
+    @return SolverResult with optimal float64 values and actions, with
+    the sweeps and backups of both phases
+    """
+    start_time = time.perf_counter()
+    coarse = value_iteration(
+        model.astype(np.float32),
+        threshold,
+        discount,
+        callback,
+        initial_values,
+        stopping_rule
+    )
+    fine = value_iteration(
+        model.astype(np.float64),
+        threshold,
+        discount,
+        None if callback is None else \
+            lambda sweep, delta, values: callback(
+                coarse.sweeps + sweep, delta, values
+            ),
+        coarse.values,
+        stopping_rule
+    )
+    return SolverResult(
+        fine.values,
+        fine.actions,
+        coarse.sweeps + fine.sweeps,
+        coarse.backups + fine.backups,
+        fine.delta,
+        time.perf_counter() - start_time,
+        fine.error_bound
+    )
+
+
+def modified_policy_iteration(
+    model: MazeModel,
+    threshold: float,
+    discount: float,
+    evaluation_depth: int=None,
+    callback: Callable[[int, float, np.ndarray], None]=None,
+    initial_values: np.ndarray=None,
+    stopping_rule: str="max_change"
+)-> SolverResult:
+    """
+    Modified policy iteration.
+
+    Every iteration improves the policy greedily, and then evaluates it
+    approximately with `evaluation_depth` cheap fixed-policy backups.
+    A depth of 0 is value iteration, an infinite depth policy iteration.
+    Stops once the `stopping_rule` of the greedy backup drops below
+    `threshold`. Every backup, greedy or not, counts as a sweep.
+    @see stopping_value
+
+    If no `evaluation_depth` is given, it adapts: it starts at 1 and
+    doubles (up to `MAX_EVALUATION_DEPTH`) every time the policy stays
+    the same, and falls back to 1 once the policy changes.
+
+    @param model: compiled maze to solve.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param evaluation_depth: number of fixed-policy backups per
+    improvement, adaptive if None.
+    @param callback: called with the sweep number, delta and values
+    after every greedy backup, if given.
+    @param initial_values: (N,) values to start from, 0 if None.
+    @see start_values
+    @param stopping_rule: one of `STOPPING_RULES`
+
+    @return SolverResult with optimal values and actions
+    """
+    check_stopping_rule(stopping_rule, discount)
+    start_time = time.perf_counter()
+    values = start_values(model, initial_values)
+    policy = None
+    depth = 1 if evaluation_depth is None else evaluation_depth
+    sweeps = 0
+
+    while True:
+        new_values, new_policy = model.greedy(values, discount)
+        difference = new_values - values
+        delta = float(np.max(np.abs(difference), initial=0.0))
+        values = new_values
+        sweeps += 1
+
+        if callback is not None:
+            callback(sweeps, delta, values)
+        if stopping_value(
+            difference[~model.terminal],
+            values,
+            discount,
+            stopping_rule
+        ) < threshold:
+            break
+
+        if evaluation_depth is None and policy is not None:
+            if np.array_equal(policy, new_policy):
+                depth = min(2 * depth, MAX_EVALUATION_DEPTH)
+            else:
+                depth = 1
+        policy = new_policy
+
+        for _ in range(depth):
+            new_values = model.policy_backup(values, policy, discount)
+            evaluation_delta = np.max(
+                np.abs(new_values - values), initial=0.0
+            )
+            values = new_values
+            sweeps += 1
+            # the policy is evaluated as good as it will be converged
+            if evaluation_delta < threshold:
+                break
+
+    _, actions = model.greedy(values, discount)
+    return SolverResult(
+        values,
+        actions,
+        sweeps,
+        sweeps * model.n_states,
+        delta,
+        time.perf_counter() - start_time,
+        error_bound(delta, discount)
+    )
+
+
+def _terminal_distances(model: MazeModel)-> tuple[np.ndarray, np.ndarray]:
+    """
+    Shortest path from every state to the nearest terminal state.
+
+    @param model: compiled maze with at least one terminal state.
+
+    @return tuple[np.ndarray, np.ndarray] with the (N,) number of steps
+    to the nearest terminal state (inf if unreachable), and the (N,)
+    next state on that path (negative if there is none)
+    """
+    import scipy.sparse
+    import scipy.sparse.csgraph
+
+    states, actions = np.nonzero(model.valid & ~model.terminal[:, None])
+    # reversed graph, from every destination back to its origin
+    graph = scipy.sparse.csr_matrix(
+        (
+            np.ones(states.size),
+            (model.successors[states, actions], states)
+        ),
+        shape=(model.n_states, model.n_states)
+    )
+    distances, next_states, _ = scipy.sparse.csgraph.dijkstra(
+        graph,
+        indices=np.flatnonzero(model.terminal),
+        unweighted=True,
+        min_only=True,
+        return_predecessors=True
+    )
+    return distances, next_states
+
+
+def _state_backup(
+    model: MazeModel,
+    values: list[float],
+    discount: float
+)-> Callable[[int], float]:
+    """
+    Create a bellman backup for single states.
+
+    The returned function reads `values` at the moment it is called,
+    which makes it possible to update `values` in place.
+
+    @param model: compiled maze to perform backups in.
+    @param values: list with current value of each state.
+    @param discount: discount for future values/states
+
+    @return Callable[[int], float] with the backup of a state index
+    """
+    # rows of the successor table are converted on demand, as
+    # converting the whole table costs more than a local re-solve
+    successors = model.successors
+    rewards = model.rewards.tolist()
+    success = model.success.tolist()
+    slip = model.slip.tolist()
+    terminal = model.terminal.tolist()
+
+    def backup(state: int)-> float:
+        if terminal[state]:
+            return 0.0
+        returns = [
+            rewards[destination] + discount * values[destination] 
+            for destination in successors[state].tolist() 
+            if destination >= 0
+        ]
+        # max_a (P - slip) * return(a) + slip * sum(all returns),
+        # where the best action has the lowest return if P < slip
+        keep = success[state] - slip[state]
+        best = max(returns) if keep >= 0 else min(returns)
+        return keep * best + slip[state] * sum(returns)
+    return backup
+
+
+def sweep_order(model: MazeModel, order: str | np.ndarray)-> np.ndarray:
+    """
+    Order in which an in-place sweep visits the states.
+
+    Possible orders:
+    - "index": increasing state index.
+    - "reverse": decreasing state index.
+    - "distance": nearest to a terminal state first, such that
+    terminal rewards spread out in as few sweeps as possible.
+    - an array with state indices, which is used as is.
+
+    @param model: compiled maze to create sweep order for.
+    @param order: name of the order, or explicit state indices.
+
+    @return np.ndarray with state indices in order of visiting
+    """
+    if not isinstance(order, str):
+        return np.asarray(order)
+    if order == "index":
+        return np.arange(model.n_states)
+    if order == "reverse":
+        return np.arange(model.n_states)[::-1]
+    if order == "distance":
+        if not model.terminal.any():
+            return np.arange(model.n_states)
+        distances, _ = _terminal_distances(model)
+        return np.argsort(distances, kind="stable")
+    raise ValueError(
+        f"Unknown sweep order {order!r}."
+        f" Expected 'index', 'reverse', 'distance' or an array."
+    )
+
+
+def gauss_seidel(
+    model: MazeModel,
+    threshold: float,
+    discount: float,
+    order: str | np.ndarray="distance",
+    callback: Callable[[int, float, np.ndarray], None]=None,
+    initial_values: np.ndarray=None
+)-> SolverResult:
+    """
+    In-place (Gauss-Seidel) value iteration.
+
+    Every backup immediately uses the newest values of the other
+    states, so a reward can travel through many states in one sweep.
+    Stops once the largest change in value of a sweep drops below
+    `threshold`.
+    @see sweep_order
+
+    @param model: compiled maze to solve.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param order: order in which every sweep visits the states.
+    @param callback: called with the sweep number, delta and values
+    after every sweep, if given.
+    @param initial_values: (N,) values to start from, 0 if None.
+    @see start_values
+
+    @return SolverResult with optimal values and actions
+    """
+    start_time = time.perf_counter()
+    states = sweep_order(model, order).tolist()
+    values = start_values(model, initial_values).tolist()
+    backup = _state_backup(model, values, discount)
+    delta = float("inf")
+    sweeps = 0
+
+    while delta >= threshold:
+        delta = 0.0
+        for state in states:
+            new_value = backup(state)
+            delta = max(delta, abs(new_value - values[state]))
+            values[state] = new_value
+        sweeps += 1
+
+        if callback is not None:
+            callback(sweeps, delta, np.array(values))
+
+    values = np.array(values)
+    _, actions = model.greedy(values, discount)
+    return SolverResult(
+        values,
+        actions,
+        sweeps,
+        sweeps * len(states),
+        delta,
+        time.perf_counter() - start_time,
+        error_bound(delta, discount)
+    )
+
+
+def prioritized_sweeping(
+    model: MazeModel,
+    threshold: float,
+    discount: float,
+    initial_values: np.ndarray=None,
+    seeds: np.ndarray=None
+)-> SolverResult:
+    """
+    Prioritized sweeping.
+
+    Keeps a heap of states, ordered by their bellman residual
+    |T V(s) - V(s)|, and always backs up the state with the largest
+    residual. After a backup, the residuals of its predecessors are
+    updated. Stops once no state has a residual of `threshold` or more.
+    There are no sweeps, only single state backups.
+
+    Updating the residuals of the predecessors takes a backup of every
+    predecessor, so every update of a state costs up to five backups,
+    and all of them are counted in `backups`, as are the backups of the
+    initial residuals. Solving a whole maze therefore usually takes
+    more backups, and time, than `gauss_seidel` or `value_iteration`.
+    Prioritized sweeping pays off when only a few states are changed.
+
+    Movement in a grid is symmetric: a state can reach its neighbour
+    if and only if the neighbour can reach the state, and a state that
+    can stay in place is its own predecessor. The predecessors of a
+    state are therefore exactly its successors.
+
+    If `seeds` are given, only the residuals of the seeds and their
+    predecessors are calculated at the start. Every other state must
+    already have a residual below `threshold`, which is the case for
+    the values of a solution of the same maze, before the seeds were
+    changed. This makes re-solving after local changes cheap.
+
+    @param model: compiled maze to solve.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param initial_values: (N,) values to start from, 0 if None.
+    @see start_values
+    @param seeds: flat indices of the changed states, or None to start
+    from the residuals of all states.
+
+    @return SolverResult with optimal values, in the floating point type
+    of `model`, and actions
+    """
+    start_time = time.perf_counter()
+    values = start_values(model, initial_values).tolist()
+    backup = _state_backup(model, values, discount)
+    successors = model.successors
+
+    def predecessors(state: int)-> set[int]:
+        return set(successors[state].tolist()) - {-1}
+
+    if seeds is None:
+        # all residuals at once, with a vectorized backup
+        residuals = np.abs(
+            model.backup(np.array(values), discount) - np.array(values)
+        )
+        backups = model.n_states
+        priorities = residuals.tolist()
+        candidates = np.flatnonzero(residuals >= threshold).tolist()
+    else:
+        # a changed state changes the backup of all of its predecessors
+        priorities = [0.0] * model.n_states
+        candidates = set()
+        for seed in np.unique(seeds).tolist():
+            candidates.add(seed)
+            candidates.update(predecessors(seed))
+        for state in candidates:
+            priorities[state] = abs(backup(state) - values[state])
+        backups = len(candidates)
+        candidates = [
+            state for state in candidates if priorities[state] >= threshold
+        ]
+    heap = [(-priorities[state], state) for state in candidates]
+    heapq.heapify(heap)
+
+    while heap:
+        priority, state = heapq.heappop(heap)
+        # skip entries that have been replaced by a newer priority
+        if -priority != priorities[state]:
+            continue
+
+        values[state] = backup(state)
+        priorities[state] = 0.0
+        backups += 1
+
+        for predecessor in predecessors(state):
+            residual = abs(backup(predecessor) - values[predecessor])
+            backups += 1
+            priorities[predecessor] = residual
+            if residual >= threshold:
+                heapq.heappush(heap, (-residual, predecessor))
+
+    values = np.array(values, dtype=model.dtype)
+    new_values, actions = model.greedy(values, discount)
+    residual = float(np.max(np.abs(new_values - values), initial=0.0))
+    return SolverResult(
+        values,
+        actions,
+        0,
+        backups,
+        residual,
+        time.perf_counter() - start_time,
+        # the values themselves were not backed up once more, which
+        # costs one extra factor of the residual
+        residual / (1.0 - discount) if discount < 1.0 else float("inf")
+    )
+
+
+def initial_policy(model: MazeModel)-> np.ndarray:
+    """
+    Policy that takes the shortest path to the nearest terminal state.
+
+    Such a policy reaches a terminal state from every state that can
+    reach one, which keeps policy evaluation well defined,
+    even when there is no discount.
+    States that can not reach a terminal state take their first valid
+    action.
+
+    @param model: compiled maze to create policy for.
+
+    @return np.ndarray with (N,) action index for every state
+    """
+    policy = np.argmax(model.valid, axis=1)
+    if model.terminal.any():
+        _, next_states = _terminal_distances(model)
+        reaches_terminal = next_states >= 0
+        policy[reaches_terminal] = np.argmax(
+            model.successors[reaches_terminal] == \
+                next_states[reaches_terminal, None],
+            axis=1
+        )
+    policy[model.terminal] = -1
+    return policy
+
+
+def evaluate_policy(
+    model: MazeModel,
+    policy: np.ndarray,
+    discount: float
+)-> np.ndarray:
+    """
+    Exact policy evaluation.
+
+    Solves the linear system (I - discount * P_policy) V = P_policy r
+    for the values of all states at once.
+
+    @param model: compiled maze to evaluate policy in.
+    @param policy: (N,) vector with the action index for every state.
+    @param discount: discount for future values/states
+
+    @return np.ndarray with (N,) value of every state under `policy`
+    """
+    import scipy.sparse
+    import scipy.sparse.linalg
+
+    transitions = model.policy_matrix(policy)
+    values = scipy.sparse.linalg.spsolve(
+        (
+            scipy.sparse.identity(model.n_states, format="csr") - \
+            discount * transitions
+        ).tocsc(),
+        transitions @ model.rewards
+    )
+    if not np.all(np.isfinite(values)):
+        raise ValueError(
+            "Policy evaluation has no unique solution. Some states never"
+            " reach a terminal state, which requires a discount below 1."
+        )
+    return values
+
+
+def policy_iteration(
+    model: MazeModel,
+    discount: float,
+    callback: Callable[[int, float, np.ndarray], None]=None,
+    initial_values: np.ndarray=None
+)-> SolverResult:
+    """
+    Policy iteration.
+
+    Evaluates the current policy exactly, using a sparse linear solve,
+    and improves it greedily. Stops once the policy is stable.
+    The number of sweeps is the number of improvement steps.
+    @see evaluate_policy
+
+    @param model: compiled maze to solve.
+    @param discount: discount for future values/states
+    @param callback: called with the iteration number, delta and values
+    after every policy evaluation, if given.
+    @param initial_values: (N,) values to start from, 0 if None.
+    The first policy is greedy with respect to these values, unless it
+    never reaches a terminal state and can not be evaluated.
+    @see start_values
+
+    @return SolverResult with optimal values and actions
+    """
+    start_time = time.perf_counter()
+    states = np.arange(model.n_states)
+    policy = initial_policy(model)
+    values = start_values(model, initial_values)
+    new_values = None
+    delta = float("inf")
+    sweeps = 0
+
+    if initial_values is not None:
+        _, greedy_policy = model.greedy(values, discount)
+        try:
+            new_values = evaluate_policy(model, greedy_policy, discount)
+            policy = greedy_policy
+        except ValueError:
+            pass
+
+    while True:
+        if new_values is None:
+            new_values = evaluate_policy(model, policy, discount)
+        delta = float(np.max(np.abs(new_values - values), initial=0.0))
+        values = new_values
+        new_values = None
+        sweeps += 1
+
+        if callback is not None:
+            callback(sweeps, delta, values)
+
+        # only switch actions that are strictly better,
+        # such that ties can not make the policy flip back and forth
+        action_values = model.action_values(values, discount)
+        best_actions = np.argmax(action_values, axis=1)
+        current_values = action_values[states, policy]
+        improved = ~model.terminal & (
+            action_values[states, best_actions] > current_values + \
+                1e-10 * np.maximum(1.0, np.abs(values))
+        )
+        if not improved.any():
+            break
+        policy[improved] = best_actions[improved]
+
+    return SolverResult(
+        values,
+        policy,
+        sweeps,
+        sweeps * model.n_states,
+        delta,
+        time.perf_counter() - start_time,
+        # the values are the exact values of a stable, optimal policy
+        0.0
+    )
+
+
+def solve(
+    model: MazeModel,
+    threshold: float,
+    discount: float,
+    method: str="value_iteration",
+    evaluation_depth: int=None,
+    order: str | np.ndarray="distance",
+    callback: Callable[[int, float, np.ndarray], None]=None,
+    initial_values: np.ndarray=None,
+    stopping_rule: str="max_change"
+)-> SolverResult:
+    """
+    Solve `model` with the given method.
+
+    @param model: compiled maze to solve.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param method: one of `METHODS`
+    @param evaluation_depth: fixed-policy backups per improvement
+    for "modified_policy_iteration", adaptive if None
+    @param order: order of visiting states for "gauss_seidel"
+    @param callback: called with the iteration number, delta and values,
+    if given. Not used by "prioritized_sweeping".
+    @param initial_values: (N,) values to start from, 0 if None.
+    @param stopping_rule: one of `STOPPING_RULES`, only supported by
+    "value_iteration" and "modified_policy_iteration".
+
+    @return SolverResult with optimal values and actions
+    """
+    if stopping_rule != "max_change" and method not in (
+        "value_iteration",
+        "modified_policy_iteration"
+    ):
+        raise ValueError(
+            f"The {stopping_rule!r} stopping rule is not supported by"
+            f" {method!r}."
+        )
+    if method == "policy_iteration":
+        return policy_iteration(model, discount, callback, initial_values)
+    if method == "modified_policy_iteration":
+        return modified_policy_iteration(
+            model, 
+            threshold, 
+            discount, 
+            evaluation_depth, 
+            callback,
+            initial_values,
+            stopping_rule
+        )
+    if method == "gauss_seidel":
+        return gauss_seidel(
+            model, 
+            threshold, 
+            discount, 
+            order, 
+            callback, 
+            initial_values
+        )
+    if method == "prioritized_sweeping":
+        return prioritized_sweeping(
+            model, 
+            threshold, 
+            discount, 
+            initial_values
+        )
+    if method == "value_iteration":
+        return value_iteration(
+            model, 
+            threshold, 
+            discount, 
+            callback, 
+            initial_values,
+            stopping_rule
+        )
+    raise ValueError(f"Unknown method {method!r}. Expected one of {METHODS}.")
@@ -0,0 +1,98 @@
+import numpy as np
+import scipy.sparse
+
+from action import ACTIONS
+from mazeModel import MazeModel
+
+
+class SparseMazeModel(MazeModel):
+    """
+    SparseMazeModel class.
+
+    Exactly like the MazeModel class, but the bellman backup is done
+    with sparse matrix-vector products.
+    @see mazeModel.py
+
+    Every action gets its own (N, N) CSR transition matrix. Since any
+    state has at most four destinations, memory grows linearly with the
+    number of states.
+    """
+
+    def __init__(
+        self,
+        grid_shape: tuple[int, int],
+        successors: np.ndarray,
+        rewards: np.ndarray,
+        terminal: np.ndarray,
+        probability: float=1.0,
+        dtype: np.dtype=np.float64
+    )-> None:
+        """
+        @var $transitions
+        **scipy.sparse.csr_matrix** (4 * N, N) matrix, with the
+        transition matrix of every action stacked on top of each other.
+        Row a * N + s holds p(s' | s, ACTIONS[a]).
+        """
+        super().__init__(
+            grid_shape,
+            successors,
+            rewards,
+            terminal,
+            probability,
+            dtype
+        )
+        self.transitions = scipy.sparse.vstack(
+            self.transition_matrices(),
+            format="csr",
+            dtype=self.dtype
+        )
+
+    def transition_matrices(self)-> list[scipy.sparse.csr_matrix]:
+        """
+        Sparse transition matrix for every action.
+
+        @return list[scipy.sparse.csr_matrix] with (N, N) transition
+        matrix for every action in `ACTIONS`
+        """
+        states = np.arange(self.n_states)
+        matrices = []
+        for action in range(len(ACTIONS)):
+            # the desired action succeeds with `success`, any other
+            # valid action is performed with `slip`
+            rows, columns, data = [], [], []
+            for outcome in range(len(ACTIONS)):
+                weights = self.success if outcome == action else self.slip
+                reachable = self.valid[:, action] & \
+                    self.valid[:, outcome] & ~self.terminal & (weights > 0)
+                rows.append(states[reachable])
+                columns.append(self.successors[reachable, outcome])
+                data.append(weights[reachable])
+
+            # duplicate entries, as in a StupidMaze corner, are summed
+            matrices.append(scipy.sparse.csr_matrix(
+                (
+                    np.concatenate(data),
+                    (np.concatenate(rows), np.concatenate(columns))
+                ),
+                shape=(self.n_states, self.n_states)
+            ))
+        return matrices
+
+    def _action_values(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Action-major bellman backup, as a single sparse mat-vec product.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with (4, N) action values
+        """
+        action_values = (
+            self.transitions @ (self.rewards + discount * values)
+        ).reshape(len(ACTIONS), self.n_states)
+        action_values += self._action_mask
+        return action_values
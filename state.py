@@ -8,6 +8,7 @@ class State:
     A state is a position in a maze, that has a location and reward.
     A state can also be terminal.
     """
+    __slots__ = ("position", "reward", "is_terminal")
 
     def __init__(
         self, 
@@ -0,0 +1,248 @@
+import numpy as np
+
+from action import ACTIONS
+
+
+class StencilMazeModel:
+    """
+    StencilMazeModel class.
+
+    A compiled maze, like the MazeModel class, for plain rectangular
+    mazes. @see mazeModel.py
+
+    Every action moves to a fixed neighbour, so the bellman backup of
+    all states is computed with four shifted views of the value grid,
+    without a successor table or transition matrix. The grid is padded
+    with one cell on every side: the padding is 0 and masked out if the
+    edges are walls (`BaseMaze`), and a copy of the edge cell itself if
+    the agent stays in place (`StupidMaze`).
+
+    Values are flat vectors in row-major order of the grid, exactly as
+    for a MazeModel, such that the same solvers can be used.
+    Only `solvers.value_iteration` is supported.
+    """
+
+    def __init__(
+        self,
+        rewards: np.ndarray,
+        terminal: np.ndarray,
+        edge_mode: str="wall",
+        probability: float=1.0,
+        dtype: np.dtype=np.float64
+    )-> None:
+        """
+        @var $grid_shape
+        **tuple[int, int]** Shape of the compiled maze.
+        @var $rewards
+        **np.ndarray** (N,) reward for entering every state.
+        @var $terminal
+        **np.ndarray** (N,) boolean mask of terminal states.
+        @var $edge_mode
+        **str** "wall" if actions that leave the grid are invalid,
+        "stay" if they let the agent stay in place.
+        @var $probability
+        **float** Chance for any given action to succeed.
+        @var $success
+        **np.ndarray** (W, H) chance for the desired action to succeed.
+        @var $slip
+        **np.ndarray** (W, H) chance of ending up at the destination of
+        one specific other valid action, when the desired one fails.
+        @var $dtype
+        **np.dtype** Floating point type of all values and rewards.
+        """
+        if edge_mode not in ("wall", "stay"):
+            raise ValueError(
+                f"Unknown edge mode {edge_mode!r}."
+                f" Expected one of ('wall', 'stay')."
+            )
+        self.grid_shape = tuple(rewards.shape)
+        self.dtype = np.dtype(dtype)
+        self.rewards = np.asarray(rewards, dtype=self.dtype).ravel()
+        self.terminal = np.asarray(terminal, dtype=bool).ravel()
+        self.edge_mode = edge_mode
+        self.probability = probability
+
+        width, height = self.grid_shape
+        n_valid = np.full(self.grid_shape, len(ACTIONS))
+        if edge_mode == "wall":
+            n_valid = n_valid - (np.arange(width) == 0)[:, None] \
+                - (np.arange(width) == width - 1)[:, None] \
+                - (np.arange(height) == 0)[None, :] \
+                - (np.arange(height) == height - 1)[None, :]
+        n_alternatives = n_valid - 1
+        self.success = np.where(
+            n_alternatives > 0, 
+            probability, 
+            1.0
+        ).astype(self.dtype)
+        self.slip = np.where(
+            n_alternatives > 0,
+            (1.0 - probability) / np.maximum(n_alternatives, 1),
+            0.0
+        ).astype(self.dtype)
+        self._keep = self.success - self.slip
+
+        # padded grid of destination returns, reused by every backup
+        self._padded = np.zeros((width + 2, height + 2), dtype=self.dtype)
+        self._terminal_states = np.flatnonzero(self.terminal)
+
+    def astype(self, dtype: np.dtype)-> "StencilMazeModel":
+        """
+        Copy of the model, with another floating point type.
+
+        @param dtype: floating point type of the copy.
+
+        @return StencilMazeModel with given dtype
+        """
+        return StencilMazeModel(
+            self.rewards.reshape(self.grid_shape),
+            self.terminal.reshape(self.grid_shape),
+            self.edge_mode,
+            self.probability,
+            dtype
+        )
+
+    @property
+    def n_states(self)-> int:
+        """
+        Number of states in the model.
+
+        @return int with number of states
+        """
+        return self.rewards.size
+
+    def _destination_returns(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> list[np.ndarray]:
+        """
+        Return for ending up in the destination of every action.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return list[np.ndarray] with a (W, H) view of r(s') + discount *
+        V(s') for every action in `ACTIONS`, 0 for invalid actions
+        """
+        padded = self._padded
+        inner = padded[1:-1, 1:-1]
+        np.multiply(values.reshape(self.grid_shape), discount, out=inner)
+        inner += self.rewards.reshape(self.grid_shape)
+        if self.edge_mode == "stay":
+            padded[0, 1:-1] = inner[0]
+            padded[-1, 1:-1] = inner[-1]
+            padded[1:-1, 0] = inner[:, 0]
+            padded[1:-1, -1] = inner[:, -1]
+
+        # the view of every action is the padded grid, shifted by the
+        # movement of the action
+        return [
+            padded[
+                1 + action.value[0]:padded.shape[0] - 1 + action.value[0],
+                1 + action.value[1]:padded.shape[1] - 1 + action.value[1]
+            ]
+            for action in ACTIONS
+        ]
+
+    def _total_returns(
+        self, 
+        destination_returns: list[np.ndarray]
+    )-> np.ndarray:
+        """
+        Slip weighted sum of the returns of all actions.
+
+        @param destination_returns: (W, H) return of every action.
+
+        @return np.ndarray with (W, H) slip * sum(all returns)
+        """
+        total_returns = np.add(
+            destination_returns[0], 
+            destination_returns[1]
+        )
+        for returns in destination_returns[2:]:
+            total_returns += returns
+        total_returns *= self.slip
+        return total_returns
+
+    def _invalidate(self, action_values: np.ndarray, action: int)-> None:
+        """
+        Set the values of an action to -inf, where it leaves the grid.
+
+        @param action_values: (W, H) values of the action.
+        @param action: index of the action in `ACTIONS`.
+        """
+        if self.edge_mode != "wall":
+            return
+        dx, dy = ACTIONS[action].value
+        if dx != 0:
+            action_values[0 if dx < 0 else -1, :] = float("-inf")
+        if dy != 0:
+            action_values[:, 0 if dy < 0 else -1] = float("-inf")
+
+    def greedy(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> tuple[np.ndarray, np.ndarray]:
+        """
+        Greedy backup of all states.
+
+        Terminal states get a value of 0 and an action index of -1.
+        Ties are broken in favour of the first action in `ACTIONS`.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return tuple[np.ndarray, np.ndarray] with the new (N,) values
+        and the (N,) indices of the best actions
+        """
+        destination_returns = self._destination_returns(values, discount)
+        # (P - slip) * return + slip * sum(all returns)
+        total_returns = self._total_returns(destination_returns)
+
+        best_values = np.full(self.grid_shape, float("-inf"), dtype=self.dtype)
+        best_actions = np.zeros(self.grid_shape, dtype=int)
+        for action, returns in enumerate(destination_returns):
+            action_values = self._keep * returns
+            action_values += total_returns
+            self._invalidate(action_values, action)
+            better = action_values > best_values
+            best_values[better] = action_values[better]
+            best_actions[better] = action
+
+        best_values = best_values.ravel()
+        best_actions = best_actions.ravel()
+        best_values[self._terminal_states] = 0.0
+        best_actions[self._terminal_states] = -1
+        return best_values, best_actions
+
+    def backup(
+        self,
+        values: np.ndarray,
+        discount: float
+    )-> np.ndarray:
+        """
+        Bellman optimality backup of all states.
+
+        Terminal states get a value of 0.
+
+        @param values: (N,) vector with current value of each state.
+        @param discount: discount for future values/states
+
+        @return np.ndarray with the new (N,) values
+        """
+        destination_returns = self._destination_returns(values, discount)
+        total_returns = self._total_returns(destination_returns)
+
+        new_values = np.full(self.grid_shape, float("-inf"), dtype=self.dtype)
+        action_values = np.empty(self.grid_shape, dtype=self.dtype)
+        for action, returns in enumerate(destination_returns):
+            np.multiply(self._keep, returns, out=action_values)
+            action_values += total_returns
+            self._invalidate(action_values, action)
+            np.maximum(new_values, action_values, out=new_values)
+
+        new_values = new_values.ravel()
+        new_values[self._terminal_states] = 0.0
+        return new_values
@@ -1,70 +1,45 @@
 import numpy as np
 
-from action import Action
 from baseMaze import BaseMaze
 
 
 class StupidMaze(BaseMaze):
     """
     Maze class that lets agent perform every possible action.
+    If an action would let the agent go out of bounce,
+    the agent stays in place.
 
     Extends BaseMaze class
     @see baseMaze.py
     """
 
+    # Actions that would leave the grid let the agent stay in place.
+    edge_mode = "stay"
+
     def __init__(
         self, 
         grid_shape: tuple[int, int], 
         rewards: np.ndarray
     )-> None:
         """
-        @var $states
-        **np.ndarray** Numpy matrix with all the states.
+        @see baseMaze.py
         """
         super().__init__(grid_shape, rewards)
 
-    def step(
-        self, 
-        start_coordinate: tuple[int, int], 
-        action: Action
-    )-> tuple[int, int]:
+    @classmethod
+    def successor_table(cls, grid_shape: tuple[int, int])-> np.ndarray:
         """
-        Step function for StupidMaze.
+        Successor table for a StupidMaze with the given shape.
 
-        Return corresponding end coordinate, for given action.
-        If action would result in agent going out of bounce, 
-        the start_coordinate will be returned.
+        Every action is valid. Actions that would leave the grid
+        let the agent stay in place.
+        @see baseMaze.py
 
-        @param start_coordinate: coordinate from where the `action`
-            will be performed.
-        @param action: action to take at `start_coordinate`
+        @param grid_shape: shape of the maze to create the table for.
 
-        @return tuple[int, int] with end coordinate
+        @return np.ndarray with (N, 4) successor indices
         """
-        # start_coordinate must be inside of maze
-        try:
-            self.states[start_coordinate]
-        except IndexError:
-            raise IndexError(
-                f"`start_coordinate` out of range."
-                f" Tried accessing {start_coordinate} from `self.states`, "
-                f"which has shape of {self.states.shape}"
-            )
-
-        new_coordinate = tuple(map(sum, zip(start_coordinate, action.value)))
-
-        # if `new_coordinate`` is out of bounce at the bottom or left, 
-        # let agent stay in place
-        if new_coordinate[0] < 0 or new_coordinate[1] < 0:
-            return start_coordinate
-        
-        # if `new_coordinate`` is out of bounce at the top or right, 
-        # let agent stay in place           
-        try:
-            self.states[new_coordinate]
-        except IndexError:
-            return start_coordinate
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-
-        return new_coordinate
+        successors = super().successor_table(grid_shape)
+        states, actions = np.nonzero(successors < 0)
+        successors[states, actions] = states
+        return successors
@@ -0,0 +1,247 @@
+import os
+import time
+
+from typing import Callable
+
+import numpy as np
+
+from baseMaze import BaseMaze
+from mazeModel import MazeModel
+from solvers import SolverResult, error_bound, precision_floor
+
+
+# Rough peak number of bytes a tile needs per state, for the compiled
+# tile model and the work arrays of a backup.
+BYTES_PER_STATE = 384
+# Default number of bytes a tile may use.
+MEMORY_BUDGET = 2**28
+
+
+def tile_rows(grid_shape: tuple[int, int], memory_budget: int)-> int:
+    """
+    Number of rows of the maze that fit in a single tile.
+
+    A row is every state with the same x coordinate, which is a
+    contiguous block of the flat state order. Every tile also holds
+    one halo row on both sides.
+
+    @param grid_shape: shape of the maze.
+    @param memory_budget: number of bytes a tile may use.
+
+    @return int with number of rows per tile
+    """
+    rows = memory_budget // (BYTES_PER_STATE * grid_shape[1]) - 2
+    if rows < 1:
+        raise ValueError(
+            f"A memory budget of {memory_budget} bytes is too small for a"
+            f" single row of {grid_shape[1]} states."
+        )
+    return min(rows, grid_shape[0])
+
+
+def _tiles(
+    width: int,
+    rows: int
+)-> list[tuple[int, int, int, int]]:
+    """
+    Split the rows of a maze into tiles.
+
+    @param width: number of rows of the maze.
+    @param rows: number of rows per tile.
+
+    @return list[tuple[int, int, int, int]] with start and stop of the
+    rows of every tile, and the start and stop including the halo rows
+    """
+    return [
+        (start, min(start + rows, width),
+         max(start - 1, 0), min(start + rows + 1, width))
+        for start in range(0, width, rows)
+    ]
+
+
+def _tile_models(
+    maze_class: type[BaseMaze],
+    rewards: np.ndarray,
+    terminals: np.ndarray,
+    probability: float,
+    tiles: list[tuple[int, int, int, int]]
+)-> Callable[[int, int], MazeModel]:
+    """
+    Create a function that compiles the model of a single tile.
+
+    The successor table of a tile only depends on its shape, so it is
+    created once for every distinct tile shape. The halo rows make sure
+    the moves out of the inner rows stay inside of the tile, and the
+    outer edges of the tile are only real edges at the maze boundary.
+
+    @param maze_class: maze class, deciding the boundary rules.
+    @param rewards: (possibly memory-mapped) reward matrix of the maze.
+    @param terminals: (possibly memory-mapped) terminal matrix.
+    @param probability: probability for any given action to succeed
+    @param tiles: tiles of the maze, created by `_tiles`.
+
+    @return Callable[[int, int], MazeModel] with the model of the rows
+    from low to high
+    """
+    height = rewards.shape[1]
+    successor_tables = {
+        high - low: maze_class.successor_table((high - low, height))
+        for _, _, low, high in tiles
+    }
+
+    def tile_model(low: int, high: int)-> MazeModel:
+        return MazeModel(
+            (high - low, height),
+            successor_tables[high - low],
+            np.asarray(rewards[low:high], dtype=float).ravel(),
+            np.asarray(terminals[low:high], dtype=bool).ravel(),
+            probability
+        )
+    return tile_model
+
+
+def tiled_value_iteration(
+    maze_class: type[BaseMaze],
+    rewards: np.ndarray,
+    terminals: np.ndarray,
+    directory: str,
+    threshold: float,
+    discount: float,
+    probability: float=1.0,
+    memory_budget: int=MEMORY_BUDGET,
+    callback: Callable[[int, float], None]=None
+)-> SolverResult:
+    """
+    Out-of-core value iteration, for mazes larger than memory.
+
+    The rewards and terminals can be memory-mapped, e.g. with
+    `np.load(path, mmap_mode="r")`, and the values are kept in
+    memory-mapped .npy files in `directory`. Every sweep backs up the
+    maze tile by tile, reading the old values of a tile and its halo
+    rows, and writing the new values to a second file. This gives the
+    exact same result as `solvers.value_iteration`, while only a
+    single tile is in memory at once. Like there, solving stops once
+    the delta of a sweep drops below `threshold`, or below the rounding
+    noise of the values.
+    @see solvers.precision_floor
+
+    The values end up in values.npy and the action indices in
+    actions.npy, in `directory`.
+    @see tile_rows
+
+    `OptimalPolicy` uses this solver for its "tiled" backend. Calling
+    it directly skips the `BaseMaze`, so the rewards and terminals
+    never have to be loaded into a maze at all.
+
+    @param maze_class: maze class, deciding the boundary rules.
+    @param rewards: (W, H) reward matrix of the maze.
+    @param terminals: (W, H) boolean matrix with the terminal cells.
+    @param directory: directory for the memory-mapped value files.
+    @param threshold: float greater than 0.0 with threshold for
+    when to stop converging
+    @param discount: discount for future values/states
+    @param probability: probability for any given action to succeed
+    @param memory_budget: number of bytes a tile may use.
+    @param callback: called with the sweep number and delta after
+    every sweep, if given.
+
+    @return SolverResult with memory-mapped values and actions
+    """
+    if rewards.shape != terminals.shape:
+        raise AttributeError(
+            f"`terminals` does not have the correct shape."
+            f" Expected {rewards.shape}, got {terminals.shape}."
+        )
+    start_time = time.perf_counter()
+    width, height = rewards.shape
+    tiles = _tiles(width, tile_rows(rewards.shape, memory_budget))
+    tile_model = _tile_models(
+        maze_class,
+        rewards,
+        terminals,
+        probability,
+        tiles
+    )
+
+    os.makedirs(directory, exist_ok=True)
+    paths = [
+        os.path.join(directory, "values.npy"),
+        os.path.join(directory, "values_next.npy")
+    ]
+    values, next_values = [
+        np.lib.format.open_memmap(path, "w+", float, rewards.shape)
+        for path in paths
+    ]
+    delta = float("inf")
+    floor = 0.0
+    sweeps = 0
+
+    while delta >= threshold and delta > floor:
+        delta = 0.0
+        # largest value of the sweep, for the rounding noise
+        scale = 0.0
+        for start, stop, low, high in tiles:
+            tile_values = np.asarray(values[low:high]).ravel()
+            new_values = tile_model(low, high).backup(
+                tile_values,
+                discount
+            )
+            # only the inner rows are correct, the halo rows belong
+            # to the neighbouring tiles
+            inner = slice((start - low) * height, (stop - low) * height)
+            delta = max(delta, float(np.max(
+                np.abs(new_values[inner] - tile_values[inner]),
+                initial=0.0
+            )))
+            scale = max(scale, float(np.max(
+                np.abs(new_values[inner]),
+                initial=0.0
+            )))
+            next_values[start:stop] = new_values[inner].reshape(
+                stop - start,
+                height
+            )
+        values, next_values = next_values, values
+        paths.reverse()
+        floor = precision_floor(np.array([scale]))
+        sweeps += 1
+
+        if callback is not None:
+            callback(sweeps, delta)
+
+    # the newest values always end up in values.npy,
+    # replacing the old values of the last sweep
+    values.flush()
+    del values, next_values
+    values_path = os.path.join(directory, "values.npy")
+    if paths[0] == values_path:
+        os.remove(paths[1])
+    else:
+        os.replace(paths[0], values_path)
+    values = np.load(values_path, mmap_mode="r+")
+
+    actions = np.lib.format.open_memmap(
+        os.path.join(directory, "actions.npy"),
+        "w+",
+        np.int8,
+        rewards.shape
+    )
+    for start, stop, low, high in tiles:
+        _, tile_actions = tile_model(low, high).greedy(
+            np.asarray(values[low:high]).ravel(),
+            discount
+        )
+        actions[start:stop] = tile_actions[
+            (start - low) * height:(stop - low) * height
+        ].reshape(stop - start, height)
+    actions.flush()
+
+    return SolverResult(
+        values.reshape(-1),
+        actions.reshape(-1),
+        sweeps,
+        sweeps * rewards.size,
+        delta,
+        time.perf_counter() - start_time,
+        error_bound(delta, discount)
+    )
@@ -1,5 +1,11 @@
 import numpy as np
-import pygame
+
+from typing import TYPE_CHECKING
+
+# pygame is only imported by the functions that draw, such that the
+# solvers and agents can be used without it
+if TYPE_CHECKING:
+    import pygame
 
 
 WINDOW_SIZE = (800, 800)
@@ -10,8 +16,8 @@ BLACK = (0, 0, 0)
 def draw_matrix(
     data_matrix: np.ndarray, 
     colour_matrix: np.ndarray, 
-    screen: pygame.display, 
-    font: pygame.font
+    screen: "pygame.display", 
+    font: "pygame.font"
 )-> None:
     """
     Draw any given matrix on given screen
@@ -21,6 +27,8 @@ def draw_matrix(
     @param screen: display to display contents on
     @param font: font for text.
     """
+    import pygame
+
     assert data_matrix.shape != colour_matrix.shape, \
         f"Wrong input dimensions! {data_matrix.shape} != {colour_matrix.shape}"
     
@@ -48,7 +56,7 @@ def draw_matrix(
 def put_agent_colour_in_colour_matrix(
     colour_matrix: np.ndarray, 
     agent_coordinate: tuple[int, int],
-    agent_colour: pygame.color
+    agent_colour: "pygame.color"
 )-> np.ndarray:
     """
     Put agent colour into colour_matrix.